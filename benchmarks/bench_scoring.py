@@ -0,0 +1,162 @@
+"""
+Before/after benchmark of the evaluation scoring on the shipped CSVs.
+
+Compares the original row-wise `apply` scoring with `evals.score_frame` and
+checks that every derived column is identical.
+
+Usage: python benchmarks/bench_scoring.py [-r <repeats>] [<csv file> ...]
+"""
+import os
+import sys
+import ast
+import time
+import getopt
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import evals
+
+
+SHIPPED_CSVS = ["all_datasets_with_evals.csv", "all_datasets_by_task_Updated.csv"]
+
+INPUT_COLUMNS = [
+    'Task', 'Dataset ID', 'Likes', 'Downloads', 'Last Modified', 'License',
+    'Models', 'Spaces', 'DOIs', 'Size of downloaded files',
+    'Size of downloaded files in bytes', 'Size of Parquet files',
+    'Size of Parquet files in bytes', 'Number of Rows', 'ArXiv Paper',
+    'ACL Paper', 'README file'
+]
+
+
+# Per-row scorers as they were in evals.py before vectorization, copied so
+# the reference does not move with the code under test
+
+def legacy_get_documentation_score(readme_text):
+    text = readme_text.lower()
+
+    has_usage = "usage" in text or "how to use" in text
+    has_license = "license" in text
+    has_examples = "example" in text or "examples" in text
+    has_citation = "citation" in text or "how to cite" in text
+    has_description = "description" in text or "overview" in text
+    has_authors = "author" in text or "maintainer" in text
+
+    return sum([has_usage, has_license, has_examples, has_citation, has_description, has_authors])
+
+
+def legacy_get_annotation_score(readme_text):
+    text = readme_text.lower()
+
+    has_task = "task categories" in text or "task_categories" in text
+    has_language = "language" in text
+    has_size = "size categories" in text or "size_categories" in text
+    has_license = "license" in text
+    has_source = "dataset source" in text or "source_datasets" in text
+    has_configs = "configs" in text or "dataset_info" in text
+
+    return sum([has_task, has_language, has_size, has_license, has_source, has_configs])
+
+
+def legacy_classify_documentation_annotation_level(readme_text):
+    avg_score = (legacy_get_documentation_score(readme_text) + legacy_get_annotation_score(readme_text)) / 2
+
+    if avg_score >= 4:
+        return "High"
+    elif avg_score >= 2:
+        return "Medium"
+    else:
+        return "Low"
+
+
+def legacy_extract_date(timestamp):
+    if pd.isnull(timestamp):
+        return None
+    return str(timestamp).split()[0]
+
+
+def legacy_safe_count_links(x):
+    if pd.isnull(x):
+        return 0
+    if isinstance(x, list):
+        return len(x)
+    try:
+        parsed = ast.literal_eval(x)
+        if isinstance(parsed, list):
+            return len(parsed)
+        else:
+            return 0
+    except Exception:
+        return 0
+
+
+def legacy_score_frame(df, now):
+    # The row-wise scoring as it was in evals.main before vectorization
+    df['documentation_score'] = df['README file'].apply(lambda x: legacy_get_documentation_score(x) if isinstance(x, str) else None)
+    df['annotation_score'] = df['README file'].apply(lambda x: legacy_get_annotation_score(x) if isinstance(x, str) else None)
+    df['documentation_annotation_level'] = df['README file'].apply(lambda x: legacy_classify_documentation_annotation_level(x) if isinstance(x, str) else "Uncategorized")
+
+    df = evals.get_popularity_score(df)
+    df['popularity_level'] = df['popularity_score'].apply(lambda x: evals.classify_popularity_level(x))
+
+    df = evals.get_adoption_score(df)
+    df['adoption_level'] = df['adoption_score'].apply(lambda x: evals.classify_adoption_level(x))
+
+    df['Last Modified'] = df['Last Modified'].apply(legacy_extract_date)
+    df['Last Modified'] = pd.to_datetime(df['Last Modified'])
+    df['recency_maintenance_score'] = df['Last Modified'].apply(lambda x: evals.months_difference(now, x))
+    df['recency_maintenance_level'] = df['recency_maintenance_score'].apply(lambda x: evals.classify_recency_maintenance_level(x))
+
+    df['licensing_transparency_level'] = df['License'].apply(lambda x: evals.classify_licensing_transparency_level(x))
+
+    df['arXiv_score'] = df['ArXiv Paper'].apply(lambda x: 1 if pd.notnull(x) and str(x).strip() != '' else 0)
+    df["acl_score"] = df["ACL Paper"].apply(legacy_safe_count_links)
+    df['doi_score'] = df['DOIs'].apply(lambda x: 1 if pd.notnull(x) and str(x).strip().lower() not in ['', 'none'] else 0)
+    df['scientific_contribution_score'] = df['arXiv_score'].fillna(0) + df['acl_score'].fillna(0) + df['doi_score'].fillna(0)
+    df['scientific_contribution_level'] = df['scientific_contribution_score'].apply(lambda x: evals.classify_scientific_contribution_level(x))
+
+    return df
+
+
+def load_input(csv_file):
+    df = pd.read_csv(csv_file)
+    # Files straight from script.py have no Spaces/DOIs; score them as empty
+    if 'Spaces' not in df.columns:
+        df['Spaces'] = 0
+    if 'DOIs' not in df.columns:
+        df['DOIs'] = "none"
+    return df[[col for col in INPUT_COLUMNS if col in df.columns]]
+
+
+def best_time(fn, df, repeats):
+    best = None
+    for _ in range(repeats):
+        frame = df.copy()
+        start = time.perf_counter()
+        result = fn(frame)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv):
+    repeats = 3
+    opts, files = getopt.getopt(argv, "r:", ["repeats="])
+    for opt, arg in opts:
+        if opt in ("-r", "--repeats"):
+            repeats = int(arg)
+
+    now = pd.Timestamp.now().normalize()
+    for csv_file in files or SHIPPED_CSVS:
+        df = load_input(csv_file)
+
+        before, expected = best_time(lambda frame: legacy_score_frame(frame, now), df, repeats)
+        after, actual = best_time(lambda frame: evals.score_frame(frame, now), df, repeats)
+
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+        print(f"{csv_file}: {len(df)} rows | row-wise {before * 1000:.1f} ms | vectorized {after * 1000:.1f} ms | {before / after:.1f}x | identical output")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,124 @@
+"""
+Cold start of the command line tools: wall time of each command in a fresh
+interpreter (best and median of --repeats runs) and which heavy modules it
+loaded, from one `python -X importtime` run. The commands exit early (usage,
+missing file, category list), so the time is almost all imports.
+
+With --budget, exits with status 1 when `cli.py list` or `cli.py --help`
+takes longer than that many milliseconds or loads a heavy module. With
+--baseline, also exits with status 1 when a command is slower than in a
+previous --json report by more than --tolerance.
+
+Usage: python benchmarks/bench_startup.py [-r <repeats>] [--budget <ms>] [--json <file>] [--baseline <file>] [--tolerance <fraction>]
+"""
+import os
+import sys
+import json
+import time
+import getopt
+import statistics
+import subprocess
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "requests", "huggingface_hub", "selenium", "tqdm"]
+
+# Commands that must stay light enough for scripted and cron use
+FAST_COMMANDS = ["cli.py --help", "cli.py list"]
+
+COMMANDS = {
+    "python -c pass": ["-c", "pass"],
+    "cli.py --help": ["cli.py", "--help"],
+    "cli.py list": ["cli.py", "list"],
+    "cli.py list --tags": ["cli.py", "list", "--tags"],
+    "cli.py crawl --list": ["cli.py", "crawl", "--list"],
+    "script.py --list": ["script.py", "--list"],
+    "cli.py eval": ["cli.py", "eval"],
+    "cli.py query --count": ["cli.py", "query", "--count"],
+    "cli.py serve (no catalog)": ["cli.py", "serve", "-f", "missing_catalog.csv"],
+}
+
+
+def run(args, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - start, completed.stderr
+
+
+def get_loaded_modules(importtime_log):
+    """
+    Top-level packages listed in a `-X importtime` log.
+    """
+    loaded = set()
+    for line in importtime_log.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            loaded.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return loaded
+
+
+def measure(args, repeats):
+    times = [run(args)[0] for _ in range(repeats)]
+    loaded = get_loaded_modules(run(args, importtime=True)[1])
+    return {
+        "best_ms": min(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "heavy_modules": [module for module in HEAVY_MODULES if module in loaded],
+    }
+
+
+def main(argv):
+    repeats = 5
+    budget_ms = None
+    json_file = None
+    baseline_file = None
+    tolerance = 0.2
+
+    opts, _ = getopt.getopt(argv, "r:", ["repeats=", "budget=", "json=", "baseline=", "tolerance="])
+    for opt, arg in opts:
+        if opt in ("-r", "--repeats"):
+            repeats = int(arg)
+        elif opt == "--budget":
+            budget_ms = float(arg)
+        elif opt == "--json":
+            json_file = arg
+        elif opt == "--baseline":
+            baseline_file = arg
+        elif opt == "--tolerance":
+            tolerance = float(arg)
+
+    results = {}
+    for name, args in COMMANDS.items():
+        results[name] = result = measure(args, repeats)
+        print(f"{name:<28} best {result['best_ms']:7.0f} ms  median {result['median_ms']:7.0f} ms  loads: {', '.join(result['heavy_modules']) or '-'}")
+
+    if json_file:
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {json_file}")
+
+    failures = []
+    if budget_ms is not None:
+        for name in FAST_COMMANDS:
+            if results[name]["best_ms"] > budget_ms:
+                failures.append(f"{name}: {results[name]['best_ms']:.0f} ms over the {budget_ms:.0f} ms budget")
+            if results[name]["heavy_modules"]:
+                failures.append(f"{name}: loads {', '.join(results[name]['heavy_modules'])}")
+
+    if baseline_file:
+        with open(baseline_file, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before and result["best_ms"] > before["best_ms"] * (1 + tolerance):
+                failures.append(f"{name}: {result['best_ms']:.0f} ms vs {before['best_ms']:.0f} ms in the baseline")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
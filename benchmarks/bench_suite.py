@@ -0,0 +1,194 @@
+"""
+Offline throughput benchmarks against the local fake Hub (benchmarks/fake_hub.py).
+
+Reports datasets/second for extraction (`script.py --all`), rows/second for
+the Hub lookups and each evaluation metric of `evals.py`, and the peak Python
+memory of each, measured with tracemalloc in a separate pass. With
+--baseline, exits with status 1 when a throughput drops, or a peak memory
+grows, by more than --tolerance relative to a previous --json report.
+
+Usage: python benchmarks/bench_suite.py [-f <seed csv>] [-r <repeats>] [-j <workers>] [--latency <s>] [--error-rate <0-1>] [--json <file>] [--baseline <file>] [--tolerance <fraction>]
+"""
+import os
+import sys
+import json
+import time
+import getopt
+import shutil
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_hub import DEFAULT_SEED_CSV, FakeHubProcess, get_task_tag
+
+
+def measure(fn, repeats=1):
+    """
+    Best wall time of `fn()` over `repeats` runs, then its peak traced memory
+    in one more run. Returns (seconds, peak bytes, last result).
+    """
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def run_suite(seed_csv, repeats, workers, hub):
+    # Imported once HF_ENDPOINT and DATASETS_SERVER_URL point at the fake Hub
+    import script
+    import evals
+    from enrichment import configure_enrichment_engine
+    from hub_index import configure_model_index
+    from metadata_cache import configure_metadata_cache
+    from readme_store import configure_readme_store
+    from size_providers import configure_size_provider
+    from extraction_journal import configure_extraction_journal
+    from hub_client import configure_hub_client
+
+    # Unthrottled, so that the suite measures the code rather than the limiter
+    client = configure_hub_client(rate=1e6, burst=1000)
+    configure_enrichment_engine({backend: workers for backend in ("hub", "page", "readme")}, progress=False)
+    configure_metadata_cache(None)
+    configure_model_index(None)
+    configure_readme_store(None)
+    configure_extraction_journal(None)
+    configure_size_provider("http")
+
+    seed = pd.read_csv(seed_csv)
+    task_mapping = {task: get_task_tag(task) for task in seed["Task"].dropna().unique()}
+
+    def extract():
+        # Fresh download cache so every run fetches the READMEs
+        os.environ["HF_HUB_CACHE"] = tempfile.mkdtemp(prefix="bench_hub_cache_")
+        import huggingface_hub.constants
+        huggingface_hub.constants.HF_HUB_CACHE = os.environ["HF_HUB_CACHE"]
+        try:
+            return script.get_arabic_datasets_for_all_categories(task_mapping)
+        finally:
+            shutil.rmtree(os.environ["HF_HUB_CACHE"], ignore_errors=True)
+
+    def benchmark(name, unit, fn, count=len):
+        # A benchmark that fails (e.g. on injected errors) is reported, not fatal
+        try:
+            seconds, peak, result = measure(fn, repeats)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            return None
+        items = count(result)
+        results[name] = {"items": items, "unit": unit, "seconds": seconds, "per_second": items / seconds, "peak_memory_bytes": peak}
+        return result
+
+    results = {}
+    requests_before = hub.requests
+    extracted = benchmark("extraction", "datasets", extract, count=lambda df: df["Dataset ID"].nunique())
+    if extracted is None:
+        return results
+    results["extraction"]["requests"] = (hub.requests - requests_before) // (repeats + 1)
+
+    metrics = list(evals.DEFAULT_METRICS)
+    prepared = benchmark("evals:lookups", "rows", lambda: evals.prepare_frame(extracted.copy(), metrics, space_index=None))
+    if prepared is None:
+        return results
+
+    now = pd.Timestamp.now().normalize()
+    for metric in metrics:
+        benchmark(f"evals:{metric}", "rows", lambda: evals.score_frame(prepared.copy(), now=now, metrics=[metric]))
+
+    if client.stats or client.failures:
+        print(client.summary())
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the regressions of `results` against a baseline report.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if "error" in result:
+            regressions.append(f"{name}: failed with {result['error']}")
+            continue
+        if not before or "error" in before:
+            continue
+        if result["per_second"] < before["per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['per_second']:.1f} {result['unit']}/s vs {before['per_second']:.1f} in the baseline")
+        if result["peak_memory_bytes"] > before["peak_memory_bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {result['peak_memory_bytes'] / 1e6:.1f} MB vs {before['peak_memory_bytes'] / 1e6:.1f} MB in the baseline")
+    return regressions
+
+
+def main(argv):
+    seed_csv = DEFAULT_SEED_CSV
+    repeats = 1
+    workers = 4
+    latency = 0.0
+    error_rate = 0.0
+    json_file = None
+    baseline_file = None
+    tolerance = 0.2
+
+    opts, _ = getopt.getopt(argv, "f:r:j:", ["file=", "repeats=", "workers=", "latency=", "error-rate=", "json=", "baseline=", "tolerance="])
+    for opt, arg in opts:
+        if opt in ("-f", "--file"):
+            seed_csv = arg
+        elif opt in ("-r", "--repeats"):
+            repeats = int(arg)
+        elif opt in ("-j", "--workers"):
+            workers = int(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+        elif opt == "--error-rate":
+            error_rate = float(arg)
+        elif opt == "--json":
+            json_file = arg
+        elif opt == "--baseline":
+            baseline_file = arg
+        elif opt == "--tolerance":
+            tolerance = float(arg)
+
+    with FakeHubProcess(seed_csv, latency=latency, error_rate=error_rate) as hub:
+        os.environ["HF_ENDPOINT"] = hub.url
+        os.environ["DATASETS_SERVER_URL"] = hub.url
+        os.environ["HF_HUB_DISABLE_TELEMETRY"] = "1"
+        os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
+        print(f"Fake Hub at {hub.url}: seeded from {seed_csv}, latency {latency * 1000:.0f} ms, error rate {error_rate:.0%}")
+        results = run_suite(seed_csv, repeats, workers, hub)
+
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<42} FAILED {result['error']}")
+            continue
+        print(f"{name:<42} {result['per_second']:>12.1f} {result['unit']}/s  ({result['items']} {result['unit']} in {result['seconds']:.3f} s, peak {result['peak_memory_bytes'] / 1e6:.1f} MB)")
+
+    if json_file:
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {json_file}")
+
+    if baseline_file:
+        with open(baseline_file, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {tolerance:.0%} against {baseline_file}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,390 @@
+"""
+A local stand-in for the Hugging Face Hub and dataset viewer, seeded from the
+rows of an evaluated CSV (by default `all_datasets_with_evals.csv`).
+
+It serves the endpoints used by `script.py` and `evals.py`:
+
+    GET  /api/datasets?filter=...          paginated listing (Link header, expand=cardData)
+    GET  /api/datasets/<id>                dataset info (tags, card data)
+    GET  /api/models?filter=dataset:<id>   models trained on a dataset
+    GET  /api/models, /api/spaces          full listings (for the usage indexes)
+    GET  /api/spaces?datasets=<id>         Spaces using a dataset
+    HEAD/GET /datasets/<id>/resolve/<revision>/README.md
+    GET  /datasets/<id>                    dataset page with the size boxes
+    GET  /size?dataset=<id>                dataset viewer sizes
+    GET  /_fake/stats                      number of requests served so far
+
+Every request waits `latency` seconds (plus up to `jitter`) and fails with
+`error_status` with probability `error_rate`, so throttling and flaky
+networks can be reproduced.
+
+Usage: python benchmarks/fake_hub.py [-f <csv file>] [--port <port>] [--latency <s>] [--jitter <s>] [--error-rate <0-1>] [--error-status <code>] [--page-size <n>]
+Then point the tools at it with HF_ENDPOINT=http://127.0.0.1:<port> DATASETS_SERVER_URL=http://127.0.0.1:<port>.
+"""
+import os
+import re
+import sys
+import ast
+import json
+import time
+import random
+import getopt
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit, unquote
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DEFAULT_SEED_CSV = "all_datasets_with_evals.csv"
+DEFAULT_PAGE_SIZE = 100
+
+
+def get_task_tag(task):
+    """
+    `task_categories` value the fake Hub gives datasets of a CSV `Task`.
+    """
+    return re.sub(r"[^a-z0-9]+", "-", str(task).strip().lower()).strip("-")
+
+
+def to_count(value):
+    count = pd.to_numeric(value, errors="coerce")
+    return 0 if pd.isnull(count) else int(count)
+
+
+def get_front_matter(readme):
+    """
+    The README's YAML front matter as a dict, as the Hub returns in `cardData`.
+    """
+    import yaml
+
+    match = re.match(r"^---\s*\n(.*?)\n---\s*(\n|$)", readme, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def to_optional_int(value):
+    number = pd.to_numeric(value, errors="coerce")
+    return None if pd.isnull(number) else int(number)
+
+
+def parse_list(value):
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+class HubData:
+    """
+    Datasets, models and Spaces derived from the seed rows. A dataset listed
+    under several tasks gets one `task_categories` tag per task.
+    """
+
+    def __init__(self, df):
+        self.datasets = {}
+        self.readmes = {}
+        self.card_data = {}
+        self.sizes = {}
+        models, spaces = [], []
+
+        for _, row in df.iterrows():
+            dataset_id = row.get("Dataset ID")
+            if not isinstance(dataset_id, str):
+                continue
+            task_tag = f"task_categories:{get_task_tag(row.get('Task'))}"
+
+            if dataset_id in self.datasets:
+                if task_tag not in self.datasets[dataset_id]["tags"]:
+                    self.datasets[dataset_id]["tags"].append(task_tag)
+                continue
+
+            last_modified = pd.to_datetime(row.get("Last Modified"), errors="coerce", utc=True)
+            last_modified = (last_modified if not pd.isnull(last_modified) else pd.Timestamp("2024-01-01", tz="UTC")).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+            tags = [task_tag, "language:ar", "modality:text"]
+            if isinstance(row.get("License"), str) and row["License"] != "none":
+                tags.append(f"license:{row['License']}")
+            if isinstance(row.get("ArXiv Paper"), str) and "arxiv.org/abs/" in row["ArXiv Paper"]:
+                tags.append("arxiv:" + row["ArXiv Paper"].split("arxiv.org/abs/", 1)[1])
+            tags += [tag for tag in parse_list(row.get("DOIs")) if isinstance(tag, str)]
+
+            self.datasets[dataset_id] = {
+                "_id": hashlib.md5(dataset_id.encode()).hexdigest()[:24],
+                "id": dataset_id,
+                "author": dataset_id.split("/")[0] if "/" in dataset_id else None,
+                "sha": hashlib.sha1(dataset_id.encode()).hexdigest(),
+                "lastModified": last_modified,
+                "private": False,
+                "gated": False,
+                "disabled": False,
+                "likes": to_count(row.get("Likes")),
+                "downloads": to_count(row.get("Downloads")),
+                "tags": tags,
+            }
+
+            readme = row.get("README file")
+            if isinstance(readme, str) and readme != "none":
+                self.readmes[dataset_id] = readme.encode("utf-8")
+                self.card_data[dataset_id] = get_front_matter(readme)
+
+            self.sizes[dataset_id] = (
+                to_optional_int(row.get("Size of downloaded files in bytes")),
+                to_optional_int(row.get("Size of Parquet files in bytes")),
+                to_optional_int(row.get("Number of Rows")),
+            )
+
+            for i in range(to_count(row.get("Models"))):
+                models.append({"id": f"fake-models/{dataset_id.replace('/', '--')}-{i}", "lastModified": last_modified, "tags": [f"dataset:{dataset_id}"]})
+            for i in range(to_count(row.get("Spaces"))):
+                spaces.append({"id": f"fake-spaces/{dataset_id.replace('/', '--')}-{i}", "lastModified": last_modified, "datasets": [dataset_id]})
+
+        newest_first = lambda item: item["lastModified"]
+        self.models = sorted(models, key=newest_first, reverse=True)
+        self.spaces = sorted(spaces, key=newest_first, reverse=True)
+
+        # Per-dataset lookups answered without scanning every repo
+        self.models_by_tag = {}
+        for model in self.models:
+            for tag in model["tags"]:
+                self.models_by_tag.setdefault(tag, []).append(model)
+        self.spaces_by_dataset = {}
+        for space in self.spaces:
+            for dataset_id in space["datasets"]:
+                self.spaces_by_dataset.setdefault(dataset_id, []).append(space)
+
+    def dataset_page(self, dataset_id):
+        # Imported here: size_providers reads DATASETS_SERVER_URL when first imported,
+        # which callers set to this server's url once it is listening
+        from size_providers import PARQUET_SIZE_CLASS, SIZE_BOX_CLASS, format_size
+
+        download_size, parquet_size, num_rows = self.sizes.get(dataset_id, (None, None, None))
+        # The page always shows both boxes, in this order
+        boxes = [
+            f'<a class="{SIZE_BOX_CLASS}">Size of downloaded dataset files:\n{format_size(download_size) if download_size is not None else ""}</a>',
+            f'<a class="{SIZE_BOX_CLASS}">Number of rows:\n{f"{num_rows:,}" if num_rows is not None else ""}</a>',
+        ]
+        parquet = f'<div class="{PARQUET_SIZE_CLASS}">{format_size(parquet_size)}</div>' if parquet_size is not None else ""
+        return f"<html><body><h1>{dataset_id}</h1>{''.join(boxes)}{parquet}</body></html>".encode("utf-8")
+
+
+class FakeHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, keep-alive
+    # clients wait out the delayed ACK (~40 ms) on every request
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def hub(self):
+        return self.server.hub
+
+    def send_body(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_json(self, data, headers=None):
+        self.send_body(200, json.dumps(data, default=str).encode("utf-8"), headers=headers)
+
+    def send_not_found(self):
+        self.send_body(404, b'{"error": "Repository not found"}', headers={"X-Error-Code": "RepoNotFound"})
+
+    def send_page(self, items, query):
+        # Cursor pagination with a `Link: <...>; rel="next"` header, like the Hub
+        start = int(query.get("cursor", ["0"])[0])
+        limit = int(query.get("limit", [self.server.page_size])[0])
+        end = start + min(limit, self.server.page_size)
+        headers = {}
+        if end < len(items):
+            next_query = {key: value for key, value in query.items() if key != "cursor"}
+            next_query["cursor"] = [str(end)]
+            headers["Link"] = f'<http://{self.headers["Host"]}{urlsplit(self.path).path}?{urlencode(next_query, doseq=True)}>; rel="next"'
+        self.send_json(items[start:end], headers)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/_fake/stats":
+            self.send_json({"requests": server.requests})
+            return
+        server.count_request()
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        if server.error_rate and random.random() < server.error_rate:
+            self.send_body(server.error_status, b'{"error": "injected error"}', headers={"Retry-After": "1"})
+            return
+
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        query = parse_qs(parts.query)
+
+        if path == "/api/datasets":
+            filters = [value.lower() for value in query.get("filter", [])]
+            items = [
+                dataset for dataset in self.hub.datasets.values()
+                if all(value in {tag.lower() for tag in dataset["tags"]} for value in filters)
+            ]
+            if query.get("sort"):
+                items.sort(key=lambda dataset: dataset["lastModified"], reverse=True)
+            if "cardData" in query.get("expand", []):
+                items = [{**dataset, "cardData": self.hub.card_data.get(dataset["id"], {})} for dataset in items]
+            self.send_page(items, query)
+        elif path.startswith("/api/datasets/"):
+            dataset_id = re.sub(r"/revision/[^/]+$", "", path[len("/api/datasets/"):])
+            dataset = self.hub.datasets.get(dataset_id)
+            self.send_json({**dataset, "cardData": self.hub.card_data.get(dataset_id, {})}) if dataset else self.send_not_found()
+        elif path == "/api/models":
+            filters = query.get("filter", [])
+            items = self.hub.models_by_tag.get(filters[0], []) if filters else self.hub.models
+            self.send_page([model for model in items if all(value in model["tags"] for value in filters)], query)
+        elif path == "/api/spaces":
+            datasets = query.get("datasets", [])
+            items = self.hub.spaces_by_dataset.get(datasets[0], []) if datasets else self.hub.spaces
+            self.send_page([space for space in items if all(dataset in space["datasets"] for dataset in datasets)], query)
+        elif path == "/size":
+            dataset_id = query.get("dataset", [None])[0]
+            if dataset_id not in self.hub.sizes:
+                self.send_body(404, b'{"error": "Not found."}')
+                return
+            download_size, parquet_size, num_rows = self.hub.sizes[dataset_id]
+            self.send_json({"size": {"dataset": {"dataset": dataset_id, "num_bytes_original_files": download_size, "num_bytes_parquet_files": parquet_size, "num_rows": num_rows}}})
+        elif "/resolve/" in path and path.startswith("/datasets/"):
+            dataset_id, filename = re.match(r"^/datasets/(.+?)/resolve/[^/]+/(.+)$", path).groups()
+            readme = self.hub.readmes.get(dataset_id)
+            if filename != "README.md" or readme is None:
+                self.send_body(404, b"Entry not found", "text/plain", {"X-Error-Code": "EntryNotFound"})
+                return
+            self.send_body(200, readme, "text/markdown", {
+                "ETag": f'"{hashlib.sha1(readme).hexdigest()}"',
+                "X-Repo-Commit": self.hub.datasets[dataset_id]["sha"],
+            })
+        elif path.startswith("/datasets/"):
+            dataset_id = path[len("/datasets/"):]
+            if dataset_id not in self.hub.datasets:
+                self.send_not_found()
+                return
+            self.send_body(200, self.hub.dataset_page(dataset_id), "text/html")
+        else:
+            self.send_body(404, b'{"error": "Unknown endpoint"}')
+
+
+class FakeHub(ThreadingHTTPServer):
+    """
+    The fake Hub server. Use as a context manager to serve it from a
+    background thread; `url` is the value for HF_ENDPOINT and DATASETS_SERVER_URL.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, seed_csv=DEFAULT_SEED_CSV, port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, page_size=DEFAULT_PAGE_SIZE):
+        super().__init__(("127.0.0.1", port), FakeHubHandler)
+        self.hub = HubData(pd.read_csv(seed_csv))
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.page_size = page_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+def _serve(seed_csv, options, urls):
+    server = FakeHub(seed_csv, **options)
+    urls.put(server.url)
+    server.serve_forever()
+
+
+class FakeHubProcess:
+    """
+    Runs a FakeHub in a child process, so the server does not compete with
+    the code under test for the GIL. Use as a context manager.
+    """
+
+    def __init__(self, seed_csv=DEFAULT_SEED_CSV, **options):
+        self.seed_csv = seed_csv
+        self.options = options
+        self.url = None
+        self._process = None
+
+    def __enter__(self):
+        import multiprocessing
+
+        urls = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(self.seed_csv, self.options, urls), daemon=True)
+        self._process.start()
+        self.url = urls.get(timeout=60)
+        return self
+
+    @property
+    def requests(self):
+        import requests
+        return requests.get(f"{self.url}/_fake/stats", timeout=10).json()["requests"]
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.join()
+
+
+def main(argv):
+    options = {}
+    seed_csv = DEFAULT_SEED_CSV
+    opts, _ = getopt.getopt(argv, "f:", ["file=", "port=", "latency=", "jitter=", "error-rate=", "error-status=", "page-size="])
+    for opt, arg in opts:
+        if opt in ("-f", "--file"):
+            seed_csv = arg
+        elif opt == "--port":
+            options["port"] = int(arg)
+        elif opt in ("--latency", "--jitter", "--error-rate"):
+            options[opt[2:].replace("-", "_")] = float(arg)
+        elif opt in ("--error-status", "--page-size"):
+            options[opt[2:].replace("-", "_")] = int(arg)
+
+    server = FakeHub(seed_csv, **options)
+    print(f"Fake Hub with {len(server.hub.datasets)} datasets, {len(server.hub.models)} models and {len(server.hub.spaces)} Spaces at {server.url}")
+    print(f"export HF_ENDPOINT={server.url} DATASETS_SERVER_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
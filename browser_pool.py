@@ -0,0 +1,197 @@
+import os
+import queue
+import threading
+import time
+import atexit
+from contextlib import contextmanager
+
+from profiling import endpoint_name, get_profiler
+
+
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "/opt/homebrew/bin/chromedriver")
+
+# The size/rows boxes on a dataset page are rendered as disabled links
+SIZE_ELEMENTS_SELECTOR = "a.pointer-events-none"
+SIZE_ELEMENTS_LABELS = ("Size of downloaded dataset files", "Number of rows")
+# The fixed sleep this wait replaced, so pages without a dataset viewer take no longer
+SIZE_ELEMENTS_TIMEOUT = 3
+
+
+def create_driver(chromedriver_path=CHROMEDRIVER_PATH):
+    # Selenium is imported where a browser is driven, so runs without the
+    # `selenium` size backend never load it
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+
+    service = Service(chromedriver_path)
+    return webdriver.Chrome(service=service, options=options)
+
+
+def is_driver_alive(driver):
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_size_elements(driver, timeout=SIZE_ELEMENTS_TIMEOUT):
+    """
+    Waits until the size/rows elements appear on the current page.
+    Returns False if they did not show up within the timeout (e.g. no dataset viewer).
+    """
+    from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def size_elements_present(d):
+        for element in d.find_elements(By.CSS_SELECTOR, SIZE_ELEMENTS_SELECTOR):
+            if any(label in element.text for label in SIZE_ELEMENTS_LABELS):
+                return True
+        return False
+
+    try:
+        # Elements re-rendered between find and `.text` are retried on the next poll
+        WebDriverWait(driver, timeout, ignored_exceptions=(StaleElementReferenceException,)).until(size_elements_present)
+        return True
+    except TimeoutException:
+        return False
+
+
+def fetch_page_source(url, pool=None):
+    pool = pool or get_browser_pool()
+
+    with pool.lease() as driver:
+        start = time.perf_counter()
+        # Go directly to the dataset page and wait for the size/rows boxes
+        driver.get(url)
+        wait_for_size_elements(driver)
+
+        page_source = driver.page_source
+        get_profiler().record_call(endpoint_name("BROWSER", url), len(page_source), time.perf_counter() - start)
+        return page_source
+
+
+class BrowserPool:
+    """
+    A pool of long-lived headless Chrome sessions.
+
+    Drivers are leased to callers with `lease()`, health-checked before each
+    lease, and recycled after `max_pages` pages or as soon as a lease fails
+    with a WebDriver error.
+    """
+
+    def __init__(self, size=1, max_pages=50, driver_factory=create_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_factory = driver_factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire_driver(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self.driver_factory()
+                with self._lock:
+                    self._pages[id(driver)] = 0
+                return driver
+
+            if is_driver_alive(driver):
+                return driver
+            self._discard(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _release(self, driver):
+        with self._lock:
+            self._pages[id(driver)] += 1
+            pages = self._pages[id(driver)]
+
+        if self._closed or pages >= self.max_pages:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        from selenium.common.exceptions import WebDriverException
+
+        self._slots.acquire()
+        driver = None
+        try:
+            driver = self._acquire_driver()
+            yield driver
+        except WebDriverException:
+            # A crashed or hung session is never handed out again
+            if driver is not None:
+                self._discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._release(driver)
+            self._slots.release()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def configure_browser_pool(size=1, max_pages=50, driver_factory=create_driver):
+    """
+    Replaces the process-wide pool used by `script.get_page_source`.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+        _default_pool = BrowserPool(size=size, max_pages=max_pages, driver_factory=driver_factory)
+    return _default_pool
+
+
+def get_browser_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+    return _default_pool
+
+
+def close_browser_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
+
+
+atexit.register(close_browser_pool)
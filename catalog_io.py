@@ -0,0 +1,169 @@
+import os
+
+import pandas as pd
+
+
+# Typed schema used for Parquet files. Columns not listed here are stored as strings.
+INT_COLUMNS = [
+    'Likes', 'Downloads', 'Models', 'Spaces', 'Number of Rows',
+    'README Quality Score', 'README Annotation Score',
+    'documentation_score', 'annotation_score', 'recency_maintenance_score',
+    'arXiv_score', 'acl_score', 'doi_score', 'scientific_contribution_score',
+]
+FLOAT_COLUMNS = [
+    'Size of downloaded files in bytes', 'Size of Parquet files in bytes',
+    'popularity_score', 'adoption_score',
+    'Likes growth', 'Downloads growth', 'Models growth',
+    'popularity_trend_score', 'adoption_trend_score',
+]
+CATEGORY_COLUMNS = [
+    'Task', 'License', 'README Quality Level',
+    'documentation_annotation_level', 'popularity_level', 'adoption_level',
+    'recency_maintenance_level', 'licensing_transparency_level',
+    'scientific_contribution_level', 'popularity_trend_level', 'adoption_trend_level',
+]
+TIMESTAMP_COLUMNS = ['Last Modified']
+
+FORMATS = ("csv", "parquet")
+
+
+def get_format(path):
+    return "parquet" if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else "csv"
+
+
+def with_extension(path, file_format, suffix=""):
+    """
+    `path` with `suffix` added to its stem and the extension of `file_format`.
+    """
+    return f"{os.path.splitext(path)[0]}{suffix}.{file_format}"
+
+
+def to_text(value):
+    if isinstance(value, (list, tuple, set)):
+        return str(value)
+    return None if pd.isnull(value) else str(value)
+
+
+def apply_schema(df):
+    """
+    Returns a copy of `df` with the catalog schema: nullable ints and floats
+    ("unknown"/"none" become missing values), categorical task/license/level
+    columns, a UTC timestamp for `Last Modified` and strings for the rest.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col in INT_COLUMNS:
+            # Floats such as 42.0 read back from CSV are whole numbers
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+        elif col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Float64")
+        elif col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in TIMESTAMP_COLUMNS:
+            df[col] = pd.to_datetime(df[col], utc=True, errors="coerce")
+        elif df[col].dtype == object:
+            # Lists (tags, ACL links, DOIs) keep the same text form as in the CSVs
+            df[col] = df[col].map(to_text).astype("string")
+    return df
+
+
+def get_catalog_columns(path):
+    """
+    Column names of a CSV or Parquet catalog, read from its header or schema only.
+    """
+    if get_format(path) == "parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_catalog(path, columns=None):
+    """
+    Reads a CSV or Parquet catalog. With `columns`, only those of them that
+    exist in the file are loaded.
+    """
+    if get_format(path) == "parquet":
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(path, columns=columns)
+
+    if columns is not None:
+        wanted = set(columns)
+        return pd.read_csv(path, usecols=lambda col: col in wanted)
+    return pd.read_csv(path)
+
+
+def iter_catalog(path, columns=None, chunksize=None):
+    """
+    Yields a catalog as DataFrames of at most `chunksize` rows (Parquet files
+    are read batch by batch), or as one frame when `chunksize` is None.
+    """
+    if chunksize is None:
+        yield read_catalog(path, columns)
+        return
+
+    if get_format(path) == "parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [col for col in columns if col in available]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted
+    yield from pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+
+
+class CatalogWriter:
+    """
+    Appends DataFrames to a CSV or Parquet file as they are produced; each
+    frame becomes a Parquet row group. Use as a context manager.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = get_format(path)
+        self.rows = 0
+        self._parquet_writer = None
+
+    def write(self, df):
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(apply_schema(df), preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # Dictionary index widths can differ between chunks
+                table = table.cast(self._parquet_writer.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            first = self.rows == 0
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_catalog(df, path):
+    if get_format(path) == "parquet":
+        apply_schema(df).to_parquet(path, index=False, engine="pyarrow")
+    else:
+        df.to_csv(path, index=False)
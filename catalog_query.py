@@ -0,0 +1,226 @@
+"""
+Faceted queries over an evaluated catalog: filters on `Task`, `License` and
+the metric levels, counts per facet, top-k rows by a score and cross-tabs.
+
+Usage: python catalog_query.py [-f <evaluated catalog>] [-w <column>=<value> ...] [--count] [--facets <column,...>|all] [--crosstab <row column>,<column>] [--top <k> --by <column> [--ascending]] [--fields <column,...>] [--limit <n>]
+
+    python catalog_query.py -w "Task=Q&A" -w licensing_transparency_level=High -w documentation_annotation_level=Low --top 10 --by popularity_score
+"""
+import sys
+import getopt
+
+import numpy as np
+import pandas as pd
+
+from catalog_io import get_catalog_columns, read_catalog
+
+
+DEFAULT_CATALOG = "all_datasets_with_evals.csv"
+
+# Columns indexed for filtering, besides every `*_level` column
+FACET_COLUMNS = ['Task', 'License']
+# Long text never loaded for queries
+TEXT_COLUMNS = ['README file']
+DEFAULT_FIELDS = ['Task', 'Dataset ID']
+
+
+def is_facet_column(col):
+    return col in FACET_COLUMNS or col.endswith("_level")
+
+
+class CatalogIndex:
+    """
+    Catalog rows (without README text) with each facet column encoded once as
+    categorical codes and one boolean mask per value. A filter is the AND of
+    its columns and the OR of the values given for a column, computed from
+    the masks; counts and cross-tabs are `bincount`s of the codes of the
+    matching rows, so no query scans the frame itself.
+    """
+
+    def __init__(self, df):
+        self.df = df.drop(columns=[col for col in TEXT_COLUMNS if col in df.columns]).reset_index(drop=True)
+        self.facets = [col for col in self.df.columns if is_facet_column(col)]
+        self.values = {}
+        self.codes = {}
+        self.masks = {}
+        for col in self.facets:
+            # Missing values get code -1 and match no filter
+            categorical = pd.Categorical(self.df[col].astype(object).where(self.df[col].notnull(), None))
+            self.values[col] = list(categorical.categories)
+            self.codes[col] = np.asarray(categorical.codes)
+            self.masks[col] = {value: self.codes[col] == code for code, value in enumerate(self.values[col])}
+
+    def __len__(self):
+        return len(self.df)
+
+    def check_columns(self, columns):
+        unknown = [col for col in columns if col not in self.codes]
+        if unknown:
+            raise ValueError(f"Not a facet column: {', '.join(unknown)}; facets: {', '.join(self.facets)}")
+
+    def mask(self, filters=None):
+        """
+        Boolean mask of the rows matching `filters`, {column: value or [values]}.
+        """
+        matched = np.ones(len(self.df), dtype=bool)
+        if not filters:
+            return matched
+        self.check_columns(filters)
+        for col, values in filters.items():
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            any_value = np.zeros(len(self.df), dtype=bool)
+            for value in values:
+                if value in self.masks[col]:
+                    any_value |= self.masks[col][value]
+            matched &= any_value
+        return matched
+
+    def count(self, filters=None):
+        return int(self.mask(filters).sum())
+
+    def facet_counts(self, columns=None, filters=None):
+        """
+        {column: {value: rows}} of the rows matching `filters`, most frequent first.
+        """
+        columns = columns or self.facets
+        self.check_columns(columns)
+        matched = self.mask(filters)
+        counts = {}
+        for col in columns:
+            codes = self.codes[col][matched]
+            totals = np.bincount(codes[codes >= 0], minlength=len(self.values[col]))
+            order = np.argsort(-totals, kind="stable")
+            counts[col] = {self.values[col][code]: int(totals[code]) for code in order if totals[code]}
+        return counts
+
+    def crosstab(self, rows, columns, filters=None):
+        """
+        Rows matching `filters` counted per value of `rows` (index) and of `columns`.
+        """
+        self.check_columns([rows, columns])
+        matched = self.mask(filters)
+        row_codes, col_codes = self.codes[rows][matched], self.codes[columns][matched]
+        present = (row_codes >= 0) & (col_codes >= 0)
+        width = len(self.values[columns])
+        cells = np.bincount(row_codes[present] * width + col_codes[present], minlength=len(self.values[rows]) * width)
+        table = pd.DataFrame(cells.reshape(len(self.values[rows]), width), index=self.values[rows], columns=self.values[columns])
+        return table.rename_axis(index=rows, columns=columns)
+
+    def get_fields(self, fields=None):
+        return [field for field in fields if field in self.df.columns] if fields else list(self.df.columns)
+
+    def select(self, filters=None, fields=None):
+        positions = np.flatnonzero(self.mask(filters))
+        return self.df.iloc[positions][self.get_fields(fields)]
+
+    def top(self, k, by, filters=None, fields=None, ascending=False):
+        """
+        The `k` rows matching `filters` with the highest (or lowest) `by`;
+        rows without a value are left out.
+        """
+        if by not in self.df.columns:
+            raise ValueError(f"Unknown column: {by}")
+        scores = pd.to_numeric(self.df[by], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        positions = np.flatnonzero(self.mask(filters) & ~np.isnan(scores))
+        keys = scores[positions] if ascending else -scores[positions]
+        if k < len(positions):
+            kept = np.argpartition(keys, k - 1)[:k]
+            positions, keys = positions[kept], keys[kept]
+        positions = positions[np.argsort(keys, kind="stable")]
+        return self.df.iloc[positions][self.get_fields(fields)]
+
+
+def load_catalog_index(path=DEFAULT_CATALOG):
+    columns = [col for col in get_catalog_columns(path) if col not in TEXT_COLUMNS]
+    return CatalogIndex(read_catalog(path, columns=columns))
+
+
+def parse_filters(expressions):
+    """
+    {column: [values]} from `column=value` expressions; a column given several
+    times matches any of its values.
+    """
+    filters = {}
+    for expression in expressions:
+        col, sep, value = expression.partition("=")
+        if not sep:
+            raise ValueError(f"Expected <column>=<value>, got {expression!r}")
+        filters.setdefault(col.strip(), []).append(value)
+    return filters
+
+
+def main(argv):
+    catalog = DEFAULT_CATALOG
+    where = []
+    show_count = False
+    facets = None
+    crosstab = None
+    top_k = None
+    by = None
+    ascending = False
+    fields = None
+    limit = 20
+    usage = "Usage: python catalog_query.py [-f <evaluated catalog>] [-w <column>=<value> ...] [--count] [--facets <column,...>|all] [--crosstab <row column>,<column>] [--top <k> --by <column> [--ascending]] [--fields <column,...>] [--limit <n>]"
+
+    try:
+        opts, _ = getopt.getopt(argv, "f:w:", ["file=", "where=", "count", "facets=", "crosstab=", "top=", "by=", "ascending", "fields=", "limit="])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+
+    for opt, arg in opts:
+        if opt in ("-f", "--file"):
+            catalog = arg
+        elif opt in ("-w", "--where"):
+            where.append(arg)
+        elif opt == "--count":
+            show_count = True
+        elif opt == "--facets":
+            facets = [] if arg == "all" else [col.strip() for col in arg.split(",") if col.strip()]
+        elif opt == "--crosstab":
+            crosstab = [col.strip() for col in arg.split(",")]
+        elif opt == "--top":
+            top_k = int(arg)
+        elif opt == "--by":
+            by = arg
+        elif opt == "--ascending":
+            ascending = True
+        elif opt == "--fields":
+            fields = [col.strip() for col in arg.split(",") if col.strip()]
+        elif opt == "--limit":
+            limit = int(arg)
+
+    if top_k is not None and by is None:
+        print("--top needs --by <column>")
+        sys.exit(2)
+    if crosstab is not None and len(crosstab) != 2:
+        print("--crosstab expects <row column>,<column>")
+        sys.exit(2)
+
+    index = load_catalog_index(catalog)
+    try:
+        filters = parse_filters(where)
+        if show_count:
+            print(f"{index.count(filters)} of {len(index)} rows")
+        if facets is not None:
+            for col, counts in index.facet_counts(facets or None, filters).items():
+                print(f"\n{col}:")
+                for value, count in counts.items():
+                    print(f"  {value:<40} {count}")
+        if crosstab is not None:
+            print(index.crosstab(crosstab[0], crosstab[1], filters).to_string())
+        if top_k is not None:
+            fields = fields or DEFAULT_FIELDS + [by] + [col for col in filters if col not in DEFAULT_FIELDS]
+            print(index.top(top_k, by, filters, fields, ascending).to_string(index=False))
+        elif not (show_count or facets is not None or crosstab is not None):
+            fields = fields or DEFAULT_FIELDS + [col for col in filters if col not in DEFAULT_FIELDS]
+            rows = index.select(filters, fields)
+            print(rows.head(limit).to_string(index=False))
+            print(f"\n{len(rows)} rows" + (f" (first {limit} shown)" if len(rows) > limit else ""))
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
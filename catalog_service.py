@@ -0,0 +1,424 @@
+"""
+Long-running catalog service: loads an evaluated catalog into memory once
+and answers category, dataset and metric queries over a local HTTP/JSON API.
+
+    GET  /health                       rows, load time, refresh state
+    GET  /categories                   tasks with their number of datasets
+    GET  /datasets?task=<task>&<column>=<value>&fields=<a,b>&limit=<n>&offset=<n>
+                                       rows filtered on Task, License or any metric level
+    GET  /datasets/<dataset id>        every row of a dataset (one per task)
+    GET  /metrics                      level counts of each metric
+    GET  /metrics/<metric>             level counts of a metric per task
+    GET  /facets?<column>=<value>&columns=<a,b>
+                                       value counts of facet columns among the filtered rows
+    GET  /crosstab?rows=<column>&columns=<column>&<column>=<value>
+                                       filtered rows counted per pair of facet values
+    POST /refresh                      re-crawl and re-evaluate in the background
+
+Queries are answered from an immutable snapshot with precomputed indexes. A
+refresh (the catalog file changing on disk, `--crawl-interval` or POST
+/refresh) builds a new snapshot aside and swaps it in, so reads never wait.
+
+Usage: python catalog_service.py [-f <evaluated catalog>] [--port <port>] [--poll-interval <s>] [--crawl-interval <s>] [--task-mapping <yaml file>] [--keywords-map <yaml file>] [--rate-limit <requests/s>] [--max-retries <n>]
+"""
+import os
+import sys
+import json
+import time
+import getopt
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from catalog_io import read_catalog, with_extension, write_catalog
+from categories import DEFAULT_KEYWORDS_MAP_PATH, DEFAULT_TASK_MAPPING_PATH, load_keywords_map, load_task_mapping
+from catalog_query import CatalogIndex
+
+
+DEFAULT_CATALOG = "all_datasets_with_evals.csv"
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 100
+
+# Long text left out of responses unless asked for with ?fields=
+HEAVY_COLUMNS = ['README file']
+# Columns /datasets can filter on, besides the metric levels
+FILTER_COLUMNS = ['Task', 'License']
+
+
+def to_json_value(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if value is None or (not isinstance(value, str) and pd.isnull(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class CatalogSnapshot:
+    """
+    Immutable in-memory view of one evaluated catalog: JSON-ready rows plus
+    positions by dataset id and by value of each filter column, and the level
+    counts of each metric.
+    """
+
+    def __init__(self, df, source=None):
+        from evals import EVAL_METRICS
+
+        self.source = source
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        self.columns = list(df.columns)
+        self.default_fields = [col for col in self.columns if col not in HEAVY_COLUMNS]
+        self.metrics = [metric for metric in EVAL_METRICS if metric in df.columns]
+
+        values = {col: [to_json_value(value) for value in df[col].astype(object)] for col in self.columns}
+        self.rows = [dict(zip(self.columns, row)) for row in zip(*(values[col] for col in self.columns))]
+
+        self.by_dataset = defaultdict(list)
+        for position, dataset_id in enumerate(values.get('Dataset ID', [])):
+            self.by_dataset[dataset_id].append(position)
+
+        self.by_value = {}
+        for col in [col for col in FILTER_COLUMNS + self.metrics if col in values]:
+            index = defaultdict(list)
+            for position, value in enumerate(values[col]):
+                index[value].append(position)
+            self.by_value[col] = dict(index)
+
+        tasks = values.get('Task', [None] * len(self.rows))
+        self.level_counts = {metric: dict(Counter(values[metric]).most_common()) for metric in self.metrics}
+        self.level_counts_by_task = {}
+        for metric in self.metrics:
+            by_task = defaultdict(Counter)
+            for task, level in zip(tasks, values[metric]):
+                by_task[task][level] += 1
+            self.level_counts_by_task[metric] = {task: dict(counts) for task, counts in by_task.items()}
+
+        # Facet counts and cross-tabs over any combination of filters
+        self.index = CatalogIndex(df)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def categories(self):
+        tasks = self.by_value.get('Task', {})
+        return [{"task": task, "datasets": len(positions)} for task, positions in sorted(tasks.items(), key=lambda item: str(item[0]))]
+
+    def select(self, filters):
+        """
+        Positions of the rows matching every {column: value} filter, in file order.
+        """
+        positions = None
+        for col, value in filters.items():
+            matched = self.by_value[col].get(value, [])
+            if positions is None:
+                positions = matched
+            else:
+                matched = set(matched)
+                positions = [position for position in positions if position in matched]
+        return list(range(len(self.rows))) if positions is None else positions
+
+    def project(self, positions, fields=None):
+        fields = fields or self.default_fields
+        return [{field: self.rows[position].get(field) for field in fields} for position in positions]
+
+
+def load_snapshot(path):
+    return CatalogSnapshot(read_catalog(path), source=path)
+
+
+def crawl_and_evaluate(path, task_mapping_path=DEFAULT_TASK_MAPPING_PATH, keywords_map_path=DEFAULT_KEYWORDS_MAP_PATH):
+    """
+    Extracts all categories with `script.py`, scores them with `evals.py` and
+    replaces the catalog at `path` (written aside, then renamed).
+    """
+    import script
+    import evals
+    from hub_index import DEFAULT_SPACE_INDEX_PATH, SpaceCountIndex, open_index
+
+    df = script.get_arabic_datasets_for_all_categories(load_task_mapping(task_mapping_path), load_keywords_map(keywords_map_path))
+    space_index = open_index(SpaceCountIndex, DEFAULT_SPACE_INDEX_PATH)
+    df = evals.score_frame(evals.prepare_frame(df, evals.DEFAULT_METRICS, space_index=space_index))
+
+    tmp_path = with_extension(path, os.path.splitext(path)[1].lstrip(".") or "csv", suffix=".tmp")
+    write_catalog(df, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class CatalogService:
+    """
+    Holds the current snapshot of the catalog at `path` and refreshes it in
+    background threads: reloaded when the file changes (checked every
+    `poll_interval` seconds) and, with `crawl_interval`, re-crawled and
+    re-evaluated on that schedule. `snapshot` is replaced in one assignment,
+    so a reader always sees either the old or the new catalog.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG, poll_interval=5.0, crawl_interval=None, task_mapping_path=DEFAULT_TASK_MAPPING_PATH, keywords_map_path=DEFAULT_KEYWORDS_MAP_PATH):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.crawl_interval = crawl_interval
+        self.task_mapping_path = task_mapping_path
+        self.keywords_map_path = keywords_map_path
+        self.refreshing = False
+        self.last_refresh = None
+        self.last_error = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._mtime = os.path.getmtime(path)
+        self.snapshot = load_snapshot(path)
+
+    def reload(self):
+        mtime = os.path.getmtime(self.path)
+        snapshot = load_snapshot(self.path)
+        self._mtime = mtime
+        self.snapshot = snapshot
+
+    def refresh(self):
+        """
+        Re-crawls and re-evaluates the catalog, then swaps it in. Returns False
+        if a refresh is already running.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        self.refreshing = True
+        try:
+            crawl_and_evaluate(self.path, self.task_mapping_path, self.keywords_map_path)
+            self.reload()
+            self.last_refresh = datetime.now(timezone.utc).isoformat()
+            self.last_error = None
+        except Exception as e:
+            # The previous snapshot keeps serving
+            self.last_error = f"{type(e).__name__}: {e}"
+        finally:
+            self.refreshing = False
+            self._refresh_lock.release()
+        return True
+
+    def refresh_in_background(self):
+        if self.refreshing:
+            return False
+        threading.Thread(target=self.refresh, daemon=True).start()
+        return True
+
+    def _watch(self):
+        next_crawl = time.monotonic() + self.crawl_interval if self.crawl_interval else None
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if not self.refreshing and os.path.getmtime(self.path) != self._mtime:
+                    self.reload()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+            if next_crawl is not None and time.monotonic() >= next_crawl:
+                self.refresh()
+                next_crawl = time.monotonic() + self.crawl_interval
+
+    def start(self):
+        threading.Thread(target=self._watch, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def health(self):
+        snapshot = self.snapshot
+        return {
+            "status": "ok",
+            "source": snapshot.source,
+            "rows": len(snapshot),
+            "loaded_at": snapshot.loaded_at,
+            "refreshing": self.refreshing,
+            "last_refresh": self.last_refresh,
+            "last_error": self.last_error,
+        }
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, keep-alive
+    # clients wait out the delayed ACK (~40 ms) on every request
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        self.send_json({"error": message}, status)
+
+    def do_GET(self):
+        service = self.server.service
+        # One snapshot per request, even if a refresh swaps it meanwhile
+        snapshot = service.snapshot
+        parts = urlsplit(self.path)
+        path = unquote(parts.path).rstrip("/")
+        query_values = parse_qs(parts.query)
+        query = {key: values[-1] for key, values in query_values.items()}
+
+        if path == "/health":
+            self.send_json(service.health())
+        elif path == "/categories":
+            self.send_json(snapshot.categories())
+        elif path == "/datasets":
+            self.send_datasets(snapshot, query)
+        elif path.startswith("/datasets/"):
+            positions = snapshot.by_dataset.get(path[len("/datasets/"):])
+            if not positions:
+                self.send_error_json(404, "Dataset not found")
+            else:
+                self.send_json(snapshot.project(positions, self.get_fields(snapshot, query)))
+        elif path == "/metrics":
+            self.send_json(snapshot.level_counts)
+        elif path.startswith("/metrics/"):
+            metric = path[len("/metrics/"):]
+            if metric not in snapshot.level_counts_by_task:
+                self.send_error_json(404, f"Unknown metric, expected one of: {', '.join(snapshot.metrics)}")
+            else:
+                self.send_json(snapshot.level_counts_by_task[metric])
+        elif path == "/facets":
+            filters = {key: values for key, values in query_values.items() if key != "columns"}
+            columns = [col for col in query.get("columns", "").split(",") if col] or None
+            self.send_index_query(lambda: snapshot.index.facet_counts(columns, self.get_filters(filters)))
+        elif path == "/crosstab":
+            filters = {key: values for key, values in query_values.items() if key not in ("rows", "columns")}
+            if "rows" not in query or "columns" not in query:
+                self.send_error_json(400, "rows and columns are required")
+            else:
+                self.send_index_query(lambda: snapshot.index.crosstab(query["rows"], query["columns"], self.get_filters(filters)).to_dict(orient="index"))
+        else:
+            self.send_error_json(404, "Not found")
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip("/") == "/refresh":
+            started = self.server.service.refresh_in_background()
+            self.send_json({"refresh": "started" if started else "already running"}, 202)
+        else:
+            self.send_error_json(404, "Not found")
+
+    def get_filters(self, filters):
+        return {('Task' if col == "task" else col): values for col, values in filters.items()}
+
+    def send_index_query(self, query):
+        try:
+            result = query()
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+            return
+        self.send_json(result)
+
+    def get_fields(self, snapshot, query):
+        if "fields" not in query:
+            return None
+        return [field for field in query["fields"].split(",") if field in snapshot.columns]
+
+    def send_datasets(self, snapshot, query):
+        filters = {col: value for col, value in query.items() if col not in ("fields", "limit", "offset")}
+        filters = self.get_filters(filters)
+        unknown = [col for col in filters if col not in snapshot.by_value]
+        if unknown:
+            self.send_error_json(400, f"Cannot filter on {', '.join(unknown)}; filterable: {', '.join(snapshot.by_value)}")
+            return
+        try:
+            limit = int(query.get("limit", DEFAULT_LIMIT))
+            offset = int(query.get("offset", 0))
+        except ValueError:
+            self.send_error_json(400, "limit and offset must be integers")
+            return
+
+        positions = snapshot.select(filters)
+        self.send_json({
+            "total": len(positions),
+            "offset": offset,
+            "datasets": snapshot.project(positions[offset:offset + limit], self.get_fields(snapshot, query)),
+        })
+
+
+class CatalogServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service, host="127.0.0.1", port=DEFAULT_PORT):
+        super().__init__((host, port), CatalogRequestHandler)
+        self.service = service
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+
+def main(argv):
+    from hub_client import DEFAULT_MAX_RETRIES, DEFAULT_RATE, configure_hub_client
+
+    catalog = DEFAULT_CATALOG
+    port = DEFAULT_PORT
+    poll_interval = 5.0
+    crawl_interval = None
+    task_mapping_path = DEFAULT_TASK_MAPPING_PATH
+    keywords_map_path = DEFAULT_KEYWORDS_MAP_PATH
+    rate_limit = DEFAULT_RATE
+    max_retries = DEFAULT_MAX_RETRIES
+    usage = "Usage: python catalog_service.py [-f <evaluated catalog>] [--port <port>] [--poll-interval <s>] [--crawl-interval <s>] [--task-mapping <yaml file>] [--keywords-map <yaml file>] [--rate-limit <requests/s>] [--max-retries <n>]"
+
+    try:
+        opts, _ = getopt.getopt(argv, "f:", ["file=", "port=", "poll-interval=", "crawl-interval=", "task-mapping=", "keywords-map=", "rate-limit=", "max-retries="])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+
+    for opt, arg in opts:
+        if opt in ("-f", "--file"):
+            catalog = arg
+        elif opt == "--port":
+            port = int(arg)
+        elif opt == "--poll-interval":
+            poll_interval = float(arg)
+        elif opt == "--crawl-interval":
+            crawl_interval = float(arg)
+        elif opt == "--task-mapping":
+            task_mapping_path = arg
+        elif opt == "--keywords-map":
+            keywords_map_path = arg
+        elif opt == "--rate-limit":
+            rate_limit = float(arg)
+        elif opt == "--max-retries":
+            max_retries = int(arg)
+
+    if not os.path.exists(catalog):
+        print(f"Catalog not found: {catalog}. " + usage)
+        sys.exit(2)
+
+    # Refreshes reuse the metadata cache, so only changed datasets are fetched again
+    from enrichment import configure_enrichment_engine
+    from metadata_cache import configure_metadata_cache
+    configure_hub_client(rate=rate_limit, max_retries=max_retries)
+    configure_enrichment_engine(progress=False)
+    configure_metadata_cache()
+
+    service = CatalogService(catalog, poll_interval=poll_interval, crawl_interval=crawl_interval,
+                             task_mapping_path=task_mapping_path, keywords_map_path=keywords_map_path).start()
+    server = CatalogServer(service, port=port)
+    print(f"Serving {catalog} ({len(service.snapshot)} rows) at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,38 @@
+"""
+Task categories and their keyword fallbacks, read from YAML files. Kept free
+of pandas and the Hub client so listing categories starts fast.
+"""
+import os
+import sys
+
+import yaml
+
+
+# Next to this module, so the tools work from any directory
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TASK_MAPPING_PATH = os.path.join(CONFIG_DIR, "task_mapping.yaml")
+DEFAULT_KEYWORDS_MAP_PATH = os.path.join(CONFIG_DIR, "keywords_map.yaml")
+
+
+def load_task_mapping(yaml_file_path=DEFAULT_TASK_MAPPING_PATH):
+    """
+    Reads the task mapping (category -> Hub task tag) from a YAML file.
+    """
+    with open(yaml_file_path, "r", encoding="utf-8") as f:
+        task_mapping = yaml.safe_load(f)
+    return task_mapping
+
+
+def load_keywords_map(yaml_file_path=DEFAULT_KEYWORDS_MAP_PATH):
+    """
+    Reads the keyword fallback of each category (`search_keywords`,
+    `required_tags`, `required_modality`). Empty when no path is given, and
+    with a warning when the file does not exist.
+    """
+    if not yaml_file_path:
+        return {}
+    if not os.path.exists(yaml_file_path):
+        print(f"Warning: no keywords map at {yaml_file_path}; the keyword fallback is disabled", file=sys.stderr)
+        return {}
+    with open(yaml_file_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
@@ -0,0 +1,81 @@
+"""
+Single entry point for the extraction, evaluation and catalog tools.
+
+Each subcommand imports only the module that implements it, so `list` never
+loads pandas, the Hub client or Selenium, and `eval` never loads Selenium.
+The options after the subcommand are those of the underlying script.
+
+Usage: python cli.py <command> [options]
+"""
+import sys
+import getopt
+import importlib
+
+
+# Subcommand -> (module whose main(argv) runs it, description)
+COMMANDS = {
+    "list": (None, "List the task categories of the task mapping"),
+    "crawl": ("script", "Extract dataset metadata (options of script.py)"),
+    "eval": ("evals", "Evaluate extracted catalogs (options of evals.py)"),
+    "query": ("catalog_query", "Faceted queries over an evaluated catalog (options of catalog_query.py)"),
+    "serve": ("catalog_service", "Serve an evaluated catalog over HTTP (options of catalog_service.py)"),
+    "snapshots": ("snapshot_store", "Add to or read the snapshot history (options of snapshot_store.py)"),
+    "readmes": ("readme_store", "Convert or show stored READMEs (options of readme_store.py)"),
+}
+
+
+def get_usage():
+    lines = ["Usage: python cli.py <command> [options]", "", "Commands:"]
+    lines += [f"  {name:<10} {description}" for name, (_, description) in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+def list_categories(argv):
+    from categories import DEFAULT_KEYWORDS_MAP_PATH, DEFAULT_TASK_MAPPING_PATH, load_keywords_map, load_task_mapping
+
+    task_mapping_path = DEFAULT_TASK_MAPPING_PATH
+    keywords_map_path = DEFAULT_KEYWORDS_MAP_PATH
+    show_tags = False
+    try:
+        opts, _ = getopt.getopt(argv, "t", ["tags", "task-mapping=", "keywords-map="])
+    except getopt.GetoptError:
+        print("Usage: python cli.py list [-t|--tags] [--task-mapping <yaml file>] [--keywords-map <yaml file>]")
+        sys.exit(2)
+
+    for opt, arg in opts:
+        if opt in ("-t", "--tags"):
+            show_tags = True
+        elif opt == "--task-mapping":
+            task_mapping_path = arg
+        elif opt == "--keywords-map":
+            keywords_map_path = arg
+
+    task_mapping = load_task_mapping(task_mapping_path)
+    keywords_map = load_keywords_map(keywords_map_path) if show_tags else {}
+    print("Available Categories:")
+    for category, task_tag in task_mapping.items():
+        if not show_tags:
+            print(f" - {category}")
+            continue
+        fallback = keywords_map.get(category, {}).get("search_keywords")
+        print(f" - {category}: task_categories:{task_tag}" + (f" (keywords: {', '.join(fallback)})" if fallback else ""))
+
+
+def main(argv):
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(get_usage())
+        sys.exit(0 if argv else 2)
+
+    command, argv = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: '{command}'\n\n{get_usage()}")
+        sys.exit(2)
+
+    if command == "list":
+        list_categories(argv)
+        return
+    importlib.import_module(COMMANDS[command][0]).main(argv)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
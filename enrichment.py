@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from tqdm import tqdm
+
+
+# Maximum number of in-flight calls per backend
+BACKENDS = ("hub", "page", "readme")
+DEFAULT_CONCURRENCY = {"hub": 4, "page": 4, "readme": 4}
+
+
+class EnrichmentEngine:
+    """
+    Runs the per-dataset enrichment stages on one bounded thread pool per backend.
+
+    Each stage is a function of the item and is named after the backend it
+    talks to (see BACKENDS), so e.g. README downloads never starve page
+    scraping. All stages of an item run concurrently; `combine` merges their
+    results once the last one finishes. Output is always in input order.
+    """
+
+    def __init__(self, concurrency=None, progress=True):
+        self.concurrency = dict(DEFAULT_CONCURRENCY)
+        self.concurrency.update(concurrency or {})
+        self.progress = progress
+
+    def run(self, items, stages, combine, desc="Enriching datasets"):
+        items = list(items)
+        if not items:
+            return []
+
+        unknown = set(stages) - set(self.concurrency)
+        if unknown:
+            raise ValueError(f"No concurrency configured for backend(s): {', '.join(sorted(unknown))}")
+
+        executors = {
+            backend: ThreadPoolExecutor(max_workers=max(1, self.concurrency[backend]), thread_name_prefix=f"enrich-{backend}")
+            for backend in stages
+        }
+        stage_results = [{} for _ in items]
+        remaining = [len(stages)] * len(items)
+        results = [None] * len(items)
+
+        try:
+            pending = {}
+            # Submit backend by backend in item order so the first rows finish first
+            for backend, fn in stages.items():
+                for index, item in enumerate(items):
+                    future = executors[backend].submit(fn, item)
+                    pending[future] = (index, backend)
+
+            with tqdm(total=len(items), desc=desc, disable=not self.progress) as progress_bar:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, backend = pending.pop(future)
+                        stage_results[index][backend] = future.result()
+                        remaining[index] -= 1
+                        if remaining[index] == 0:
+                            results[index] = combine(items[index], stage_results[index])
+                            stage_results[index] = None
+                            progress_bar.update(1)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
+
+_default_engine = None
+
+
+def configure_enrichment_engine(concurrency=None, progress=True):
+    global _default_engine
+    _default_engine = EnrichmentEngine(concurrency=concurrency, progress=progress)
+    return _default_engine
+
+
+def get_enrichment_engine():
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = EnrichmentEngine()
+    return _default_engine
@@ -1,44 +1,34 @@
+import os
 import sys
 import getopt
-import pandas as pd
-def get_documentation_score(readme_text):
+from collections import Counter
+from datetime import datetime
 
-    text = readme_text.lower()
+import numpy as np
+import pandas as pd
 
-    has_usage = "usage" in text or "how to use" in text
-    has_license = "license" in text
-    has_examples = "example" in text or "examples" in text
-    has_citation = "citation" in text or "how to cite" in text
-    has_description = "description" in text or "overview" in text
-    has_authors = "author" in text or "maintainer" in text
+from hub_index import DEFAULT_SPACE_INDEX_PATH, SpaceCountIndex, get_doi_from_tags, open_index
+from readme_analysis import analyze_readme, analyze_readmes
+from readme_store import ReadmeStore
+from profiling import configure_profiler, get_profiler
+from snapshot_store import SnapshotStore
+from hub_client import DEFAULT_MAX_RETRIES, DEFAULT_RATE, configure_hub_client, get_hub_client
+from catalog_io import FORMATS, CatalogWriter, get_catalog_columns, get_format, iter_catalog, read_catalog, with_extension
 
-    score = sum([has_usage, has_license, has_examples, has_citation, has_description, has_authors])
 
-    return score
+def get_documentation_score(readme_text):
+    return analyze_readme(readme_text).documentation_score
 
 
 def get_annotation_score(readme_text):
-
-    text = readme_text.lower()
-
-    has_task = "task categories" in text or "task_categories" in text
-    has_language = "language" in text
-    has_size = "size categories" in text or "size_categories" in text
-    has_license = "license" in text
-    has_source = "dataset source" in text or "source_datasets" in text
-    has_configs = "configs" in text or "dataset_info" in text
-
-    score = sum([has_task, has_language, has_size, has_license, has_source, has_configs])
-
-    return score
+    return analyze_readme(readme_text).annotation_score
 
 
 def classify_documentation_annotation_level(readme_text):
     
-    score_doc = get_documentation_score(readme_text)
-    score_ann = get_annotation_score(readme_text)
+    analysis = analyze_readme(readme_text)
     
-    avg_score = (score_doc + score_ann) / 2
+    avg_score = (analysis.documentation_score + analysis.annotation_score) / 2
 
     if avg_score >= 4:
         return "High"   # Excellent Threshold
@@ -50,10 +40,9 @@ def classify_documentation_annotation_level(readme_text):
 
 def classify_documentation_annotation_level_t(readme_text):
     
-    score_doc = get_documentation_score(readme_text)
-    score_ann = get_annotation_score(readme_text)
+    analysis = analyze_readme(readme_text)
     
-    t_score = score_doc + score_ann
+    t_score = analysis.documentation_score + analysis.annotation_score
 
     if t_score >= 8:
         return "High"   # Excellent Threshold
@@ -63,6 +52,18 @@ def classify_documentation_annotation_level_t(readme_text):
         return "Low"
     
 
+def classify_documentation_annotation_levels(readme_texts, documentation_scores, annotation_scores):
+    # float64 so that missing scores (nullable ints from Parquet) compare as False
+    avg_scores = (pd.Series(documentation_scores).astype("float64") + pd.Series(annotation_scores).astype("float64")) / 2
+    is_readme = readme_texts.map(lambda x: isinstance(x, str))
+
+    return np.select(
+        [~is_readme, avg_scores >= 4, avg_scores >= 2],
+        ["Uncategorized", "High", "Medium"],
+        default="Low"
+    )
+
+
 def get_popularity_score(df):
     df['popularity_score'] = df['Likes'].fillna(0) + df['Downloads'].fillna(0)
     return df
@@ -77,9 +78,12 @@ def classify_popularity_level(popularity_score):
         return "Low"
     
 
+def classify_popularity_levels(popularity_scores):
+    return np.select([popularity_scores >= 200, popularity_scores >= 100], ["High", "Medium"], default="Low")
+
+
 def get_spaces_count(dataset_id):
-    from huggingface_hub import HfApi
-    api = HfApi()
+    api = get_hub_client().api
 
     spaces = api.list_spaces(datasets=dataset_id)
     spaces = len([space.id for space in spaces])
@@ -87,6 +91,30 @@ def get_spaces_count(dataset_id):
     return spaces
 
 
+def get_spaces_counts(dataset_ids, space_index=None, offline=False):
+    """
+    Returns {dataset id: Spaces count} for every unique dataset id, read from
+    the Spaces index when one is given and queried once per id otherwise.
+    Ids whose lookup fails, or every id offline without an index, are left
+    missing (None), not counted as zero.
+    """
+    unique_ids = {dataset_id for dataset_id in dataset_ids if isinstance(dataset_id, str)}
+
+    if space_index is not None:
+        return {dataset_id: space_index.count(dataset_id) for dataset_id in unique_ids}
+    if offline:
+        return dict.fromkeys(unique_ids)
+
+    def safe_get_spaces_count(dataset_id):
+        try:
+            return get_spaces_count(dataset_id)
+        except Exception as e:
+            get_hub_client().record_failure("spaces", dataset_id, e)
+            return None
+
+    return {dataset_id: safe_get_spaces_count(dataset_id) for dataset_id in unique_ids}
+
+
 def get_adoption_score(df):
     df['adoption_score'] = df['Models'].fillna(0) + df['Spaces'].fillna(0)
     return df
@@ -101,8 +129,45 @@ def classify_adoption_level(adoption_score):
         return "Low"
     
 
+def classify_adoption_levels(adoption_scores):
+    return np.select([adoption_scores >= 50, adoption_scores >= 20], ["High", "Medium"], default="Low")
+
+
+# Trend scores are the growth over the last snapshots (snapshot_store.py);
+# datasets without history are missing and classified "Uncategorized"
+def get_growth(df, column):
+    if column not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[column], errors="coerce").astype("float64")
+
+
+def get_popularity_trend_score(df):
+    df['popularity_trend_score'] = get_growth(df, 'Likes growth') + get_growth(df, 'Downloads growth')
+    return df
+
+
+def classify_popularity_trend_levels(popularity_trend_scores):
+    return np.select(
+        [popularity_trend_scores.isnull(), popularity_trend_scores >= 100, popularity_trend_scores > 0],
+        ["Uncategorized", "High", "Medium"],
+        default="Low"
+    )
+
+
+def get_adoption_trend_score(df):
+    df['adoption_trend_score'] = get_growth(df, 'Models growth')
+    return df
+
+
+def classify_adoption_trend_levels(adoption_trend_scores):
+    return np.select(
+        [adoption_trend_scores.isnull(), adoption_trend_scores >= 5, adoption_trend_scores > 0],
+        ["Uncategorized", "High", "Medium"],
+        default="Low"
+    )
+
+
 def extract_date(timestamp):
-    import pandas as pd
     if pd.isnull(timestamp):
         return None
     return str(timestamp).split()[0]
@@ -112,16 +177,20 @@ def months_difference(d1, d2):
     return (d1.year - d2.year) * 12 + (d1.month - d2.month)
 
 
-def get_recency_maintenance_score(df):
-    import pandas as pd
-    from datetime import datetime
+def extract_dates(timestamps):
+    return timestamps.astype(str).str.split().str[0].where(timestamps.notnull(), None)
+
 
-    df['Last Modified'] = df['Last Modified'].apply(extract_date)
+def get_recency_maintenance_score(df, now=None):
+    df['Last Modified'] = extract_dates(df['Last Modified'])
     df['Last Modified'] = pd.to_datetime(df['Last Modified'])
 
-    now = pd.to_datetime(datetime.now().date())
+    now = now if now is not None else pd.to_datetime(datetime.now().date())
 
-    df['recency_maintenance_score'] = df['Last Modified'].apply(lambda x: months_difference(now, x)) 
+    last_modified = df['Last Modified'].dt
+    months = (now.year - last_modified.year.astype("float64")) * 12 + (now.month - last_modified.month.astype("float64"))
+    # Whole months come out as ints unless a date is missing
+    df['recency_maintenance_score'] = months if months.isnull().any() else months.astype("int64")
 
     return df
 
@@ -135,6 +204,10 @@ def classify_recency_maintenance_level(recency_maintenance_score):
         return "Low"
     
 
+def classify_recency_maintenance_levels(recency_maintenance_scores):
+    return np.select([recency_maintenance_scores <= 6, recency_maintenance_scores <= 12], ["High", "Medium"], default="Low")
+
+
 def classify_licensing_transparency_level(license):
     if license == "none":
         return "Low"
@@ -144,46 +217,117 @@ def classify_licensing_transparency_level(license):
         return "High"  
 
 
+def classify_licensing_transparency_levels(licenses):
+    return np.select([licenses == "none", (licenses == "unknown") | (licenses == "other")], ["Low", "Medium"], default="High")
+
+
 def get_doi_info(dataset_name):
-    from huggingface_hub import HfApi
-    api = HfApi()
+    api = get_hub_client().api
 
     # Get dataset info
     dataset_info = api.dataset_info(dataset_name)
 
-    for tag in dataset_info.tags:
-        if "doi" in tag:
-            doi = tag
-            break
-        else:  
-            doi = None
-    return [doi] if doi else "none"
+    return get_doi_from_tags(dataset_info.tags)
 
 
 def get_doi_score(dataset_name):
-    from huggingface_hub import HfApi
-    api = HfApi()
+    doi = get_doi_info(dataset_name)
+    return len(doi) if doi != "none" else 0
+
+
+def parse_tags(tags):
+    import ast
+
+    if isinstance(tags, list):
+        return tags
+    if not isinstance(tags, str):
+        return None
+    try:
+        parsed = ast.literal_eval(tags)
+        return list(parsed) if isinstance(parsed, (list, tuple)) else None
+    except Exception:
+        return None
 
-    # Get dataset info
-    dataset_info = api.dataset_info(dataset_name)
 
-    for tag in dataset_info.tags:
-        if "doi" in tag:
-            doi = tag
-            break
-        else:  
-            doi = None
-    return len([doi]) if doi else 0
+DEFAULT_TAGS_CACHE_PATH = "dataset_tags_cache.json"
+
+
+def fetch_dataset_tags(dataset_ids, cache_path=DEFAULT_TAGS_CACHE_PATH, offline=False):
+    """
+    Returns {dataset id: tags} for every unique dataset id, for files written
+    before script.py kept the tags. Ids are read from the on-disk cache first,
+    then from one listing of Arabic datasets, and only the rest one by one.
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    unique_ids = {dataset_id for dataset_id in dataset_ids if isinstance(dataset_id, str)}
+
+    cached_tags = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached_tags = json.load(f)
+
+    missing = unique_ids - set(cached_tags)
+    if missing and offline:
+        print(f"Warning: no cached tags for {len(missing)} datasets, their DOIs are left empty (--offline)")
+    elif missing:
+        api = get_hub_client().api
+
+        for dataset in api.list_datasets(language="ar"):
+            if dataset.id in missing:
+                cached_tags[dataset.id] = dataset.tags or []
+
+        def get_tags(dataset_id):
+            try:
+                return dataset_id, api.dataset_info(dataset_id).tags or []
+            except Exception as e:
+                if "401" in str(e) or "Repository Not Found" in str(e):
+                    print(f"⚠️ Skipping DOI for {dataset_id} (not found or private)")
+                else:
+                    get_hub_client().record_failure("dois", dataset_id, e)
+                return dataset_id, None
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for dataset_id, tags in executor.map(get_tags, sorted(missing - set(cached_tags))):
+                if tags is not None:
+                    cached_tags[dataset_id] = tags
+
+        if cache_path:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(cached_tags, f)
+
+    return {dataset_id: cached_tags.get(dataset_id) for dataset_id in unique_ids}
+
+
+def get_dois(df, tags_cache_path=DEFAULT_TAGS_CACHE_PATH, offline=False, dataset_tags=None):
+    """
+    DOIs column for the frame: kept as is when the file already has it, derived
+    from the `Tags` column written by script.py, and only looked up on the Hub
+    (or in `dataset_tags`, {dataset id: tags} fetched beforehand) for legacy
+    files that have neither.
+    """
+    if 'DOIs' in df.columns:
+        return df['DOIs']
+
+    if 'Tags' in df.columns:
+        tags = df['Tags'].map(parse_tags)
+    else:
+        if dataset_tags is None:
+            dataset_tags = fetch_dataset_tags(df['Dataset ID'], tags_cache_path, offline)
+        tags = df['Dataset ID'].map(dataset_tags)
+
+    return tags.map(lambda x: get_doi_from_tags(x) if isinstance(x, list) else None)
 
 
 def safe_count_links(x):
     import ast
-    import pandas as pd
-    
-    if pd.isnull(x):
-        return 0
+
+    # Lists first: pd.isnull of a list is elementwise
     if isinstance(x, list):
         return len(x)
+    if pd.isnull(x):
+        return 0
     try:
         parsed = ast.literal_eval(x)
         if isinstance(parsed, list):
@@ -194,12 +338,24 @@ def safe_count_links(x):
         return 0
 
 
-def get_scientific_contribution_scores(df):
-    import pandas as pd
+def count_links(links):
+    """
+    `safe_count_links` over a column, evaluated once per distinct value.
+    """
+    try:
+        codes, uniques = pd.factorize(links)
+    except TypeError:
+        # Unhashable values (lists straight from script.py)
+        return links.apply(safe_count_links)
 
-    df['arXiv_score'] = df['ArXiv Paper'].apply(lambda x: 1 if pd.notnull(x) and str(x).strip() != '' else 0)
-    df["acl_score"] = df["ACL Paper"].apply(safe_count_links)
-    df['doi_score'] = df['DOIs'].apply(lambda x: 1 if pd.notnull(x) and str(x).strip().lower() not in ['', 'none'] else 0)
+    counts = np.array([safe_count_links(value) for value in uniques] + [0], dtype="int64")
+    return pd.Series(counts[codes], index=links.index)
+
+
+def get_scientific_contribution_scores(df):
+    df['arXiv_score'] = (df['ArXiv Paper'].notnull() & (df['ArXiv Paper'].astype(str).str.strip() != '')).astype("int64")
+    df["acl_score"] = count_links(df["ACL Paper"]) if "ACL Paper" in df.columns else 0
+    df['doi_score'] = (df['DOIs'].notnull() & ~df['DOIs'].astype(str).str.strip().str.lower().isin(['', 'none'])).astype("int64")
     
     df['scientific_contribution_score'] = df['arXiv_score'].fillna(0) + df['acl_score'].fillna(0) + df['doi_score'].fillna(0)
 
@@ -215,10 +371,12 @@ def classify_scientific_contribution_level(scientific_contribution_score):
         return "Low"
     
 
+def classify_scientific_contribution_levels(scientific_contribution_scores):
+    return np.select([scientific_contribution_scores >= 3, scientific_contribution_scores >= 2], ["High", "Medium"], default="Low")
+
+
 def extract_acl_links(readme_content):
-    import re
-    acl_pattern = r"https?://aclanthology\.org/\S+"
-    return set(re.findall(acl_pattern, readme_content))
+    return set(analyze_readme(readme_content).acl_links)
 
 
 def get_acl_links_from_readme(df):
@@ -233,104 +391,602 @@ def safe_get_doi_info(dataset_id):
         if "401" in str(e) or "Repository Not Found" in str(e):
             print(f"⚠️ Skipping DOI for {dataset_id} (not found or private)")
         else:
-            print(f"Warning: Failed to get DOI for {dataset_id}: {e}")
+            get_hub_client().record_failure("dois", dataset_id, e)
         return None
 
 
+def get_readme_scores(df, readme_store=None):
+    """
+    Returns (README column, documentation scores, annotation scores). Files
+    that reference READMEs by hash use their precomputed scores, and only load
+    the texts from the README store when those are missing.
+    """
+    if 'README file' in df.columns:
+        readmes = df['README file']
+    elif 'README Hash' not in df.columns:
+        # Annotation-only extraction: card data scores, no README to document
+        readmes = pd.Series(None, index=df.index, dtype=object)
+        return readmes, pd.Series(np.nan, index=df.index), df['README Annotation Score']
+    else:
+        readmes = df['README Hash']
+        if 'README Quality Score' in df.columns and 'README Annotation Score' in df.columns:
+            return readmes, df['README Quality Score'], df['README Annotation Score']
+        readmes = (readme_store or ReadmeStore()).load_column(readmes)
+
+    readme_analysis = analyze_readmes(readmes)
+    return readmes, readme_analysis['documentation_score'], readme_analysis['annotation_score']
+
+
+EVAL_METRICS = [
+    "documentation_annotation_level",
+    "popularity_level",
+    "adoption_level",
+    "recency_maintenance_level",
+    "licensing_transparency_level",
+    "scientific_contribution_level",
+    "popularity_trend_level",
+    "adoption_trend_level"
+]
+
+# Need a snapshot history (--snapshots), so they are not computed by default
+TREND_METRICS = ["popularity_trend_level", "adoption_trend_level"]
+DEFAULT_METRICS = [metric for metric in EVAL_METRICS if metric not in TREND_METRICS]
+
+# Input columns each metric reads; `Dataset ID` is needed for Spaces and DOIs
+IDENTITY_COLUMNS = ['Task', 'Dataset ID']
+METRIC_COLUMNS = {
+    "documentation_annotation_level": ['README file', 'README Hash', 'README Quality Score', 'README Annotation Score'],
+    "popularity_level": ['Likes', 'Downloads'],
+    "adoption_level": ['Models', 'Spaces'],
+    "recency_maintenance_level": ['Last Modified'],
+    "licensing_transparency_level": ['License'],
+    "scientific_contribution_level": ['ArXiv Paper', 'ACL Paper', 'DOIs', 'Tags'],
+    "popularity_trend_level": ['Likes growth', 'Downloads growth'],
+    "adoption_trend_level": ['Models growth'],
+}
+
+# Default name of the combined summary of a multi-file run
+SUMMARY_FILENAME = "evaluation_summary.csv"
+
+# Input columns kept in the evaluated output, metric inputs or not
+OUTPUT_COLUMNS = [
+    'Task', 'Dataset ID', 'Likes', 'Downloads', 'Last Modified', 'License',
+    'Models', 'Spaces', 'DOIs', 'Size of downloaded files',
+    'Size of downloaded files in bytes', 'Size of Parquet files',
+    'Size of Parquet files in bytes', 'Number of Rows', 'ArXiv Paper',
+    'ACL Paper', 'README file', 'Likes growth', 'Downloads growth', 'Models growth'
+]
+
+# Derived columns added for each metric, used to map `-e <score column>` to its metric
+METRIC_SCORE_COLUMNS = {
+    "documentation_annotation_level": ['documentation_score', 'annotation_score'],
+    "popularity_level": ['popularity_score'],
+    "adoption_level": ['adoption_score'],
+    "recency_maintenance_level": ['recency_maintenance_score'],
+    "licensing_transparency_level": [],
+    "scientific_contribution_level": ['arXiv_score', 'acl_score', 'doi_score', 'scientific_contribution_score'],
+    "popularity_trend_level": ['popularity_trend_score'],
+    "adoption_trend_level": ['adoption_trend_score'],
+}
+
+
+def get_metric(column):
+    """
+    Metric a level or score column belongs to, or None.
+    """
+    for metric in EVAL_METRICS:
+        if column == metric or column in METRIC_SCORE_COLUMNS[metric]:
+            return metric
+    return None
+
+
+def get_input_columns(metrics):
+    columns = list(IDENTITY_COLUMNS)
+    for metric in metrics:
+        columns += [col for col in METRIC_COLUMNS[metric] if col not in columns]
+    return columns
+
+
+def score_frame(df, now=None, readme_store=None, metrics=None):
+    """
+    Adds the derived score and level columns of `metrics` (default: all) to
+    `df` with whole-column operations.
+    """
+    metrics = DEFAULT_METRICS if metrics is None else metrics
+    profiler = get_profiler()
+
+    if "documentation_annotation_level" in metrics:
+        with profiler.stage("score:documentation_annotation_level"):
+            readmes, df['documentation_score'], df['annotation_score'] = get_readme_scores(df, readme_store)
+            df['documentation_annotation_level'] = classify_documentation_annotation_levels(readmes, df['documentation_score'], df['annotation_score'])
+
+    if "popularity_level" in metrics:
+        with profiler.stage("score:popularity_level"):
+            df = get_popularity_score(df)
+            df['popularity_level'] = classify_popularity_levels(df['popularity_score'])
+
+    if "adoption_level" in metrics:
+        with profiler.stage("score:adoption_level"):
+            df = get_adoption_score(df)
+            df['adoption_level'] = classify_adoption_levels(df['adoption_score'])
+
+    if "recency_maintenance_level" in metrics:
+        with profiler.stage("score:recency_maintenance_level"):
+            df = get_recency_maintenance_score(df, now)
+            df['recency_maintenance_level'] = classify_recency_maintenance_levels(df['recency_maintenance_score'])
+
+    if "licensing_transparency_level" in metrics:
+        with profiler.stage("score:licensing_transparency_level"):
+            df['licensing_transparency_level'] = classify_licensing_transparency_levels(df['License'])
+
+    if "scientific_contribution_level" in metrics:
+        with profiler.stage("score:scientific_contribution_level"):
+            df = get_scientific_contribution_scores(df)
+            df['scientific_contribution_level'] = classify_scientific_contribution_levels(df['scientific_contribution_score'])
+
+    if "popularity_trend_level" in metrics:
+        with profiler.stage("score:popularity_trend_level"):
+            df = get_popularity_trend_score(df)
+            df['popularity_trend_level'] = classify_popularity_trend_levels(df['popularity_trend_score'])
+
+    if "adoption_trend_level" in metrics:
+        with profiler.stage("score:adoption_trend_level"):
+            df = get_adoption_trend_score(df)
+            df['adoption_trend_level'] = classify_adoption_trend_levels(df['adoption_trend_score'])
+
+    return df
+
+
+# Rows are matched with the previous evaluation on these columns
+ROW_KEY_COLUMNS = ['Task', 'Dataset ID']
+
+
+def normalize_fingerprint_value(value):
+    """
+    Canonical text of an input value, so that CSV and Parquet round trips
+    (5 vs 5.0, NaN vs None, list vs its repr) fingerprint the same.
+    """
+    if isinstance(value, (list, tuple)):
+        return str(list(value))
+    if value is None or (not isinstance(value, str) and pd.isnull(value)):
+        return ""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def get_row_fingerprints(df, columns):
+    normalized = pd.DataFrame({col: df[col].astype(object).map(normalize_fingerprint_value) for col in columns}, index=df.index)
+    return pd.util.hash_pandas_object(normalized, index=False)
+
+
+def get_row_keys(df):
+    task, dataset_id = (df[col].astype(object).map(normalize_fingerprint_value) for col in ROW_KEY_COLUMNS)
+    return task + "\x1f" + dataset_id
+
+
+def score_frame_incremental(df, previous, now=None, readme_store=None, metrics=None):
+    """
+    `score_frame` that reuses the scores of `previous` (an earlier evaluated
+    output) for rows whose input columns are unchanged. New and changed rows
+    are scored again, and recency always is since it depends on the date.
+    Returns the scored frame and the number of reused rows.
+    """
+    metrics = DEFAULT_METRICS if metrics is None else metrics
+    reusable = [
+        metric for metric in metrics
+        if metric != "recency_maintenance_level" and all(col in previous.columns for col in METRIC_SCORE_COLUMNS[metric] + [metric])
+    ]
+    score_columns = [col for metric in reusable for col in METRIC_SCORE_COLUMNS[metric] + [metric]]
+    fingerprint_columns = [
+        col for col in get_input_columns(reusable)
+        if col in df.columns and col in previous.columns and col not in ROW_KEY_COLUMNS
+    ]
+
+    keys = get_row_keys(df)
+    previous = previous[~get_row_keys(previous).duplicated()]
+    previous_keys = pd.Index(get_row_keys(previous))
+    positions = previous_keys.get_indexer(keys)
+
+    fingerprints = get_row_fingerprints(df, fingerprint_columns).to_numpy()
+    previous_fingerprints = get_row_fingerprints(previous, fingerprint_columns).to_numpy()
+    # -1 (no previous row) would index past an empty previous frame
+    found = positions >= 0
+    reused = found.copy()
+    reused[found] = fingerprints[found] == previous_fingerprints[positions[found]]
+    if not score_columns:
+        reused[:] = False
+
+    input_columns = list(df.columns)
+    parts = [previous[score_columns].iloc[positions[reused]].set_index(df.index[reused])]
+    if not reused.all():
+        fresh = score_frame(df[~reused].copy(), now=now, readme_store=readme_store, metrics=reusable)
+        parts.insert(0, fresh[score_columns])
+    df = df.copy()
+    for col in score_columns:
+        # All-missing parts would otherwise decide the column dtype
+        values = [part[col] for part in parts if part[col].notnull().any()] or [parts[0][col]]
+        df[col] = pd.concat(values).reindex(df.index)
+
+    if "recency_maintenance_level" in metrics:
+        df = score_frame(df, now=now, metrics=["recency_maintenance_level"])
+
+    # Same column order as a full `score_frame`
+    ordered = [col for metric in metrics for col in METRIC_SCORE_COLUMNS[metric] + [metric]]
+    df = df[input_columns + [col for col in ordered if col in df.columns]]
+    return df, int(reused.sum())
+
+
+def prepare_frame(df, metrics, space_index=None, offline=False, trends=None, space_counts=None, dataset_tags=None):
+    """
+    Fills in the `Spaces` and `DOIs` columns the metrics need where the file
+    does not have them (and adds the `<column> growth` columns of `trends`,
+    from `SnapshotStore.growth`) and keeps the relevant input columns.
+    `space_counts` and `dataset_tags` are lookups already made for several
+    files at once.
+    """
+    profiler = get_profiler()
+    if trends is not None and any(metric in TREND_METRICS for metric in metrics):
+        with profiler.stage("lookup:trends"):
+            for col in trends.columns:
+                df[col] = df['Dataset ID'].map(trends[col])
+    if "adoption_level" in metrics:
+        with profiler.stage("lookup:spaces"):
+            # Like DOIs, counts already in the file are kept; only missing ones are looked up
+            spaces = df['Spaces'] if 'Spaces' in df.columns else pd.Series(np.nan, index=df.index)
+            missing = spaces.isnull()
+            if missing.any():
+                if space_counts is None:
+                    space_counts = get_spaces_counts(df.loc[missing, 'Dataset ID'], space_index, offline=offline)
+                spaces = spaces.where(~missing, df['Dataset ID'].map(space_counts)).infer_objects()
+            df['Spaces'] = spaces
+    if "scientific_contribution_level" in metrics:
+        with profiler.stage("lookup:dois"):
+            df['DOIs'] = get_dois(df, offline=offline, dataset_tags=dataset_tags)
+
+    # Keep relevant columns
+    columns_to_keep = list(OUTPUT_COLUMNS)
+    if 'README file' not in df.columns:
+        # READMEs kept in the README store: carry the hash and precomputed scores
+        columns_to_keep += ['README Hash', 'README Quality Score', 'README Annotation Score']
+    return df[[col for col in columns_to_keep if col in df.columns]].copy()
+
+
+def get_report_columns(columns, eval_column=None):
+    """
+    Columns whose counts are printed: every metric by default or with "all",
+    otherwise `eval_column` if it exists.
+    """
+    if not eval_column or eval_column.lower() == "all":
+        return [metric for metric in EVAL_METRICS if metric in columns]
+    return [eval_column] if eval_column in columns else []
+
+
+def combine_value_counts(counts, chunk_counts):
+    """
+    Adds the `value_counts` of one chunk to the running {column: counts}.
+    """
+    combined = dict(counts)
+    for col, col_counts in chunk_counts.items():
+        if col in combined:
+            col_counts = combined[col].add(col_counts, fill_value=0).astype("int64").sort_values(ascending=False, kind="stable")
+        combined[col] = col_counts
+    return combined
+
+
+def get_input_files(pattern):
+    """
+    Catalogs to evaluate for `--file`: the file itself, or the CSV and Parquet
+    files of a directory or matching a glob, minus earlier `_evaluated` outputs
+    and summaries.
+    """
+    import glob
+
+    if os.path.isfile(pattern):
+        return [pattern]
+    paths = glob.glob(os.path.join(pattern, "*")) if os.path.isdir(pattern) else glob.glob(pattern)
+    paths = sorted(
+        path for path in paths
+        if os.path.splitext(path)[1].lower() in (".csv", ".parquet", ".pq")
+        and not os.path.splitext(path)[0].endswith("_evaluated")
+        and os.path.basename(path) != SUMMARY_FILENAME
+    )
+    input_files = []
+    for path in paths:
+        # Other tables in the same directory are not catalogs
+        if 'Dataset ID' not in get_catalog_columns(path):
+            print(f"Skipping {path}: no 'Dataset ID' column")
+            continue
+        input_files.append(path)
+    return input_files
+
+
+def get_level_summary(df, metrics):
+    """
+    Counter of (task, metric, level) -> rows, for the combined report.
+    """
+    tasks = df['Task'].astype(object).where(df['Task'].notnull(), "none") if 'Task' in df.columns else pd.Series("none", index=df.index)
+    summary = Counter()
+    for metric in metrics:
+        if metric in df.columns:
+            for (task, level), count in pd.DataFrame({"task": tasks, "level": df[metric].astype(object)}).value_counts(dropna=False).items():
+                summary[(task, metric, level)] += int(count)
+    return summary
+
+
+def get_summary_frame(summary):
+    frame = pd.DataFrame([(task, metric, level, count) for (task, metric, level), count in summary.items()], columns=["Task", "metric", "level", "count"])
+    order = {metric: position for position, metric in enumerate(EVAL_METRICS)}
+    return frame.sort_values(["Task", "metric", "level"], key=lambda col: col.map(order) if col.name == "metric" else col).reset_index(drop=True)
+
+
+def evaluate_file(csv_file, metrics, out_file=None, eval_column=None, now=None, space_index=None, space_counts=None,
+                  dataset_tags=None, trends=None, readme_store_path=None, chunksize=None, previous_file=None, offline=False):
+    """
+    Scores one catalog chunk by chunk, writing it to `out_file` if given.
+    Returns a dict with the value counts of the report columns, the
+    task x metric x level summary and the reused/scored row counts.
+    """
+    readme_store = ReadmeStore(readme_store_path) if readme_store_path else None
+    now = now if now is not None else pd.to_datetime(datetime.now().date())
+
+    # --- Earlier evaluated output whose scores are reused for unchanged rows ---
+    previous = None
+    if previous_file:
+        score_columns = [col for metric in metrics for col in METRIC_SCORE_COLUMNS[metric] + [metric]]
+        previous = read_catalog(previous_file, columns=get_input_columns(metrics) + score_columns)
+
+    # --- Load only the columns the metrics need (and, when saving, the ones the
+    # output keeps), chunk by chunk with --chunksize ---
+    columns = get_input_columns(metrics)
+    if out_file:
+        # READMEs kept in the store are not carried over as text
+        columns += [col for col in OUTPUT_COLUMNS if col not in columns and not (readme_store and col == 'README file')]
+    result = {"file": csv_file, "out_file": out_file, "counts": {}, "report_columns": None, "summary": None, "rows": 0, "reused": 0}
+    writer = CatalogWriter(out_file) if out_file else None
+    try:
+        for df in iter_catalog(csv_file, columns=columns, chunksize=chunksize):
+            df = prepare_frame(df, metrics, space_index=space_index, offline=offline, trends=trends, space_counts=space_counts, dataset_tags=dataset_tags)
+
+            # --- Derived scores and levels ---
+            if previous is not None:
+                df, reused = score_frame_incremental(df, previous, now=now, readme_store=readme_store, metrics=metrics)
+                result["reused"] += reused
+            else:
+                df = score_frame(df, now=now, readme_store=readme_store, metrics=metrics)
+            result["rows"] += len(df)
+
+            if result["report_columns"] is None:
+                result["report_columns"] = get_report_columns(df.columns, eval_column)
+            result["counts"] = combine_value_counts(result["counts"], {col: df[col].value_counts(dropna=False) for col in result["report_columns"]})
+            chunk_summary = get_level_summary(df, metrics)
+            result["summary"] = chunk_summary if result["summary"] is None else result["summary"] + chunk_summary
+
+            if writer is not None:
+                writer.write(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return result
+
+
+def evaluate_file_in_worker(profile, *args, **kwargs):
+    """
+    `evaluate_file` in a worker process of a multi-file run. With `profile`,
+    the worker profiles the file on its own and returns that profile in the
+    result (`profile`) for the parent to merge.
+    """
+    profiler = configure_profiler(enabled=profile)
+    result = evaluate_file(*args, **kwargs)
+    result["profile"] = profiler.export() if profile else None
+    return result
+
+
 def main(argv):
     csv_file = None
     eval_column = None
     save_csv = False
+    out_format = None
+    metrics = None
+    space_index_path = DEFAULT_SPACE_INDEX_PATH
+    rebuild_space_index = False
+    offline = False
+    readme_store_path = None
+    chunksize = None
+    previous_file = None
+    profile = False
+    profile_json = None
+    rate_limit = DEFAULT_RATE
+    max_retries = DEFAULT_MAX_RETRIES
+    snapshot_dir = None
+    trend_window = 4
+    jobs = None
+    summary_file = None
+
+    usage = "Usage: python evals.py -f <csv|parquet file, directory or glob> [-j <processes>] [--summary <file>] -e <column_name|all> [-s] [--format csv|parquet] [--chunksize <rows>] [--previous <evaluated file>] [--profile] [--profile-json <file>] [--rate-limit <requests/s>] [--max-retries <n>] [--metrics <metric,...>] [--spaces-index <file> | --no-spaces-index] [--rebuild-spaces-index] [--offline] [--readme-store <dir>] [--snapshots <dir>] [--trend-window <n>]"
 
     # --- Parse command line arguments ---
     try:
-        opts, args = getopt.getopt(argv, "f:e:s", ["file=", "eval=", "save"])
+        opts, args = getopt.getopt(argv, "f:e:sj:", ["file=", "jobs=", "summary=", "eval=", "save", "format=", "metrics=", "chunksize=", "previous=", "profile", "profile-json=", "rate-limit=", "max-retries=", "spaces-index=", "no-spaces-index", "rebuild-spaces-index", "offline", "readme-store=", "snapshots=", "trend-window="])
     except getopt.GetoptError:
-        print("Usage: python evals.py -f <csvfile> -e <column_name|all> [-s]")
+        print(usage)
         sys.exit(2)
 
     for opt, arg in opts:
         if opt in ("-f", "--file"):
             csv_file = arg
+        elif opt in ("-j", "--jobs"):
+            jobs = int(arg)
+        elif opt == "--summary":
+            summary_file = arg
         elif opt in ("-e", "--eval"):
             eval_column = arg
         elif opt in ("-s", "--save"):
             save_csv = True
+        elif opt == "--format":
+            out_format = arg
+        elif opt == "--chunksize":
+            chunksize = int(arg)
+        elif opt == "--previous":
+            previous_file = arg
+        elif opt == "--profile":
+            profile = True
+        elif opt == "--profile-json":
+            profile = True
+            profile_json = arg
+        elif opt == "--rate-limit":
+            rate_limit = float(arg)
+        elif opt == "--max-retries":
+            max_retries = int(arg)
+        elif opt == "--metrics":
+            metrics = [metric.strip() for metric in arg.split(",") if metric.strip()]
+        elif opt == "--spaces-index":
+            space_index_path = arg
+        elif opt == "--no-spaces-index":
+            space_index_path = None
+        elif opt == "--rebuild-spaces-index":
+            rebuild_space_index = True
+        elif opt == "--offline":
+            offline = True
+        elif opt == "--readme-store":
+            readme_store_path = arg
+        elif opt == "--snapshots":
+            snapshot_dir = arg
+        elif opt == "--trend-window":
+            trend_window = int(arg)
 
     if not csv_file:
-        print("CSV file is required. Usage: python evals.py -f <csvfile> -e <column_name|all> [-s]")
+        print("CSV file is required. " + usage)
         sys.exit(2)
 
-    # --- Load CSV ---
-    df = pd.read_csv(csv_file)
-
-    # --- Preprocessing ---
-    df['Spaces'] = df['Dataset ID'].apply(lambda x: get_spaces_count(x) if isinstance(x, str) else None)
-    df['DOIs'] = df['Dataset ID'].apply(lambda x: safe_get_doi_info(x) if isinstance(x, str) else None)
-
-    # Keep relevant columns
-    columns_to_keep = [
-        'Task', 'Dataset ID', 'Likes', 'Downloads', 'Last Modified', 'License',
-        'Models', 'Spaces', 'DOIs', 'Size of downloaded files',
-        'Size of downloaded files in bytes', 'Size of Parquet files',
-        'Size of Parquet files in bytes', 'Number of Rows', 'ArXiv Paper',
-        'ACL Paper', 'README file'
-    ]
-    df = df[[col for col in columns_to_keep if col in df.columns]]
-
-    # --- Derived scores and levels ---
-    df['documentation_score'] = df['README file'].apply(lambda x: get_documentation_score(x) if isinstance(x, str) else None)
-    df['annotation_score'] = df['README file'].apply(lambda x: get_annotation_score(x) if isinstance(x, str) else None)
-    df['documentation_annotation_level'] = df['README file'].apply(lambda x: classify_documentation_annotation_level(x) if isinstance(x, str) else "Uncategorized")
-
-    df = get_popularity_score(df)
-    df['popularity_level'] = df['popularity_score'].apply(lambda x: classify_popularity_level(x))
-
-    df = get_adoption_score(df)
-    df['adoption_level'] = df['adoption_score'].apply(lambda x: classify_adoption_level(x))
+    input_files = get_input_files(csv_file)
+    if not input_files:
+        print(f"No CSV or Parquet files found for '{csv_file}'.")
+        sys.exit(2)
+    if previous_file and len(input_files) > 1:
+        print("--previous takes the earlier output of a single file; it cannot be used with several input files.")
+        sys.exit(2)
 
-    df = get_recency_maintenance_score(df)
-    df['recency_maintenance_level'] = df['recency_maintenance_score'].apply(lambda x: classify_recency_maintenance_level(x))
+    if out_format is not None and out_format not in FORMATS:
+        print(f"Unknown format '{out_format}', expected one of: {', '.join(FORMATS)}")
+        sys.exit(2)
 
-    df['licensing_transparency_level'] = df['License'].apply(lambda x: classify_licensing_transparency_level(x))
+    if metrics is not None:
+        unknown = [metric for metric in metrics if metric not in EVAL_METRICS]
+        if unknown:
+            print(f"Unknown metrics: {', '.join(unknown)}. Available: {', '.join(EVAL_METRICS)}")
+            sys.exit(2)
+    elif eval_column and eval_column.lower() != "all" and not save_csv and get_metric(eval_column):
+        # Only printing one metric: skip the columns (and lookups) the others need
+        metrics = [get_metric(eval_column)]
+    elif snapshot_dir:
+        metrics = EVAL_METRICS
+    if not snapshot_dir and any(metric in TREND_METRICS for metric in metrics or []):
+        print(f"Trend metrics ({', '.join(TREND_METRICS)}) need a snapshot history; add --snapshots <dir>.")
+        sys.exit(2)
+    metrics = [metric for metric in EVAL_METRICS if metric in (metrics or DEFAULT_METRICS)]
+
+    profiler = configure_profiler(enabled=profile)
+    hub_client = configure_hub_client(rate=rate_limit, max_retries=max_retries)
+
+    # --- Shared lookups and a fixed date, so every chunk and file is scored the same way ---
+    space_index = None
+    if "adoption_level" in metrics and space_index_path:
+        if offline and rebuild_space_index:
+            print("--rebuild-spaces-index needs the Hub; it cannot be used with --offline.")
+            sys.exit(2)
+        try:
+            with profiler.stage("spaces_index"):
+                space_index = open_index(SpaceCountIndex, space_index_path, rebuild=rebuild_space_index, offline=offline)
+        except FileNotFoundError:
+            print(f"No Spaces index at {space_index_path}; run once online to build it, or use --no-spaces-index (Spaces are then left missing offline).")
+            sys.exit(2)
+    trends = None
+    if snapshot_dir and any(metric in TREND_METRICS for metric in metrics):
+        with profiler.stage("snapshots"):
+            trends = SnapshotStore(snapshot_dir).growth(trend_window)
+    now = pd.to_datetime(datetime.now().date())
 
-    df = get_scientific_contribution_scores(df)
-    df['scientific_contribution_level'] = df['scientific_contribution_score'].apply(lambda x: classify_scientific_contribution_level(x))
+    def get_out_file(path):
+        # --- Saved next to the input if -s is used (same format unless --format) ---
+        return with_extension(path, out_format or get_format(path), suffix="_evaluated") if save_csv else None
 
-    # --- Evaluation metrics list ---
-    eval_metrics = [
-        "documentation_annotation_level",
-        "popularity_level",
-        "adoption_level",
-        "recency_maintenance_level",
-        "licensing_transparency_level",
-        "scientific_contribution_level"
-    ]
+    if len(input_files) == 1:
+        result = evaluate_file(
+            input_files[0], metrics, get_out_file(input_files[0]), eval_column, now=now, space_index=space_index, trends=trends,
+            readme_store_path=readme_store_path, chunksize=chunksize, previous_file=previous_file, offline=offline,
+        )
+        results = [result]
+    else:
+        # --- Lookups for all files at once, then one process per file ---
+        space_counts = None
+        dataset_tags = None
+        dataset_ids = {path: read_catalog(path, columns=['Dataset ID', 'Spaces', 'DOIs', 'Tags']) for path in input_files}
+        if "adoption_level" in metrics:
+            with profiler.stage("lookup:spaces"):
+                without_spaces = [df['Dataset ID'][df['Spaces'].isnull()] if 'Spaces' in df.columns else df['Dataset ID'] for df in dataset_ids.values()]
+                space_counts = get_spaces_counts(pd.concat(without_spaces), space_index, offline=offline)
+        legacy = [df['Dataset ID'] for df in dataset_ids.values() if 'DOIs' not in df.columns and 'Tags' not in df.columns]
+        if "scientific_contribution_level" in metrics and legacy:
+            with profiler.stage("lookup:dois"):
+                dataset_tags = fetch_dataset_tags(pd.concat(legacy), offline=offline)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs or min(len(input_files), os.cpu_count() or 1)) as executor:
+            futures = [
+                executor.submit(
+                    evaluate_file_in_worker, profile, path, metrics, get_out_file(path), eval_column, now=now, space_counts=space_counts,
+                    dataset_tags=dataset_tags, trends=trends, readme_store_path=readme_store_path, chunksize=chunksize, offline=offline,
+                )
+                for path in input_files
+            ]
+            results = [future.result() for future in futures]
+
+        for result in results:
+            if result["profile"] is not None:
+                profiler.merge(result["profile"])
+            saved = f" -> {result['out_file']}" if result['out_file'] else ""
+            print(f"{result['file']}: {result['rows']} rows{saved}")
 
     # --- Print counts ---
-    if eval_column:
-        if eval_column.lower() == "all":
-            for metric in eval_metrics:
-                if metric in df.columns:
-                    print(f"\n{metric} Counts:")
-                    print(df[metric].value_counts(dropna=False))
-        elif eval_column in df.columns:
-            print(f"\n{eval_column} Counts:")
-            print(df[eval_column].value_counts(dropna=False))
-        else:
-            print(f"Error: Column '{eval_column}' not found in CSV.")
-    else:
-        # Default: print all metrics
-        for metric in eval_metrics:
-            if metric in df.columns:
-                print(f"\n{metric} Counts:")
-                print(df[metric].value_counts(dropna=False))
+    counts = {}
+    for result in results:
+        counts = combine_value_counts(counts, result["counts"])
+    report_columns = results[0]["report_columns"]
+    if eval_column and eval_column.lower() != "all" and not report_columns:
+        print(f"Error: Column '{eval_column}' not found in CSV.")
+    for col in report_columns or []:
+        print(f"\n{col} Counts:")
+        print(counts[col])
+
+    if previous_file:
+        reused_rows, scored_rows = result["reused"], result["rows"]
+        print(f"\nIncremental evaluation: {reused_rows} of {scored_rows} rows reused from {previous_file}, {scored_rows - reused_rows} rescored (recency recomputed for all)")
+
+    # --- Task x metric x level summary across all files ---
+    if len(input_files) > 1:
+        summary = get_summary_frame(sum((result["summary"] for result in results if result["summary"]), Counter()))
+        for metric, metric_summary in summary.groupby("metric", sort=False):
+            print(f"\n{metric} by Task:")
+            print(metric_summary.pivot_table(index="Task", columns="level", values="count", fill_value=0, aggfunc="sum"))
+        if summary_file or save_csv:
+            summary_file = summary_file or os.path.join(os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in input_files]), SUMMARY_FILENAME)
+            summary.to_csv(summary_file, index=False)
+            print(f"\nSummary saved to {summary_file}")
 
-    # --- Save to CSV if -s is used ---
     if save_csv:
-        out_file = csv_file.replace(".csv", "_evaluated.csv")
-        df.to_csv(out_file, index=False)
-        print(f"\n✅ Evaluation completed. Results saved to {out_file}")
+        saved = results[0]["out_file"] if len(results) == 1 else f"{len(results)} files"
+        print(f"\n✅ Evaluation completed. Results saved to {saved}")
+
+    if hub_client.stats or hub_client.failures:
+        print(f"\n{hub_client.summary()}")
+
+    if profile:
+        print(f"\n{profiler.summary()}")
+        if profile_json:
+            profiler.dump(profile_json)
+            print(f"Profile saved to {profile_json}")
 
 
 if __name__ == "__main__":
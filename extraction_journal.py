@@ -0,0 +1,98 @@
+import json
+import os
+
+
+class ExtractionJournal:
+    """
+    Append-only record of an extraction run, so that a crash or Ctrl-C does
+    not lose the datasets already enriched.
+
+    Each finished dataset record is appended to `<path>` as one JSON line and
+    flushed to disk, then its id is appended to the checkpoint file
+    `<path>.done`. A record only counts as done once its id is checkpointed, so
+    a line torn by a crash is ignored and fetched again on resume.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.checkpoint_path = f"{path}.done"
+        self.done = set()
+
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.endswith("\n")}
+
+        mode = "a" if resume else "w"
+        self._records = open(path, mode, encoding="utf-8")
+        self._checkpoint = open(self.checkpoint_path, mode, encoding="utf-8")
+
+    def __contains__(self, dataset_id):
+        return dataset_id in self.done
+
+    def __len__(self):
+        return len(self.done)
+
+    def append(self, dataset_id, record):
+        if dataset_id in self.done:
+            return
+        self._records.write(json.dumps(record, default=str) + "\n")
+        self._records.flush()
+        os.fsync(self._records.fileno())
+        self._checkpoint.write(dataset_id + "\n")
+        self._checkpoint.flush()
+        self.done.add(dataset_id)
+
+    def records(self, dataset_ids=None):
+        """
+        Returns {dataset id: record} for the checkpointed records (only those in
+        `dataset_ids` if given), read back from disk.
+        """
+        self._records.flush()
+        wanted = self.done if dataset_ids is None else self.done & set(dataset_ids)
+
+        records = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line of a crashed run
+                    continue
+                if record.get("Dataset ID") in wanted:
+                    records[record["Dataset ID"]] = record
+        return records
+
+    def close(self):
+        self._records.close()
+        self._checkpoint.close()
+
+    def finalize(self):
+        """
+        Removes the journal once its records are compacted into the result file.
+        """
+        self.close()
+        os.remove(self.path)
+        os.remove(self.checkpoint_path)
+
+
+def get_journal_path(output_path):
+    return f"{os.path.splitext(output_path)[0]}.journal.jsonl"
+
+
+_default_journal = None
+
+
+def configure_extraction_journal(path=None, resume=False):
+    """
+    Sets the journal `script.enrich_datasets` streams records to. Pass path=None
+    to keep records in memory only.
+    """
+    global _default_journal
+    if _default_journal is not None:
+        _default_journal.close()
+    _default_journal = ExtractionJournal(path, resume=resume) if path else None
+    return _default_journal
+
+
+def get_extraction_journal():
+    return _default_journal
@@ -0,0 +1,214 @@
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from profiling import get_profiler
+
+
+DEFAULT_RATE = 20.0
+DEFAULT_BURST = 20
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+
+# Statuses worth another attempt; 429 also slows the host's rate down
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate` tokens per second, up to `burst`.
+
+    The rate adapts to the server (AIMD): it is halved on every throttled
+    response, down to `min_rate`, and grows back by `increase` (a fraction of
+    `max_rate`) after each successful one, up to `max_rate`.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, min_rate=0.5, increase=0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.increase = increase * rate
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+
+
+def get_retry_after(response):
+    """
+    Seconds to wait from a `Retry-After` header (delay or HTTP date), or None.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedRetryAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that waits for a token of the request's host before each
+    attempt, and retries throttled, failing (5xx) or unreachable requests,
+    honoring `Retry-After` and otherwise backing off exponentially with jitter.
+    """
+
+    def __init__(self, client, **kwargs):
+        self.client = client
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        limiter = self.client.get_limiter(urlsplit(request.url).netloc)
+        for attempt in range(self.client.max_retries + 1):
+            limiter.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.client.max_retries:
+                    raise
+                self.client.sleep_before_retry(attempt)
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                limiter.on_success()
+                return response
+
+            if response.status_code == 429:
+                limiter.on_throttle()
+                self.client.count("throttled")
+            if attempt == self.client.max_retries:
+                return response
+
+            response.close()
+            self.client.sleep_before_retry(attempt, get_retry_after(response))
+        return response
+
+
+class HubClient:
+    """
+    One shared client for every Hub and dataset viewer call: pooled
+    connections, a token bucket per host and retries with backoff.
+
+    `install()` makes `huggingface_hub` (list_* calls, dataset_info,
+    hf_hub_download) create its sessions here. Lookups that still fail after
+    all retries are recorded with `record_failure`, so callers can tell
+    them apart from real zero values.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF, pool_maxsize=32):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_maxsize = pool_maxsize
+        self.stats = Counter()
+        self.failures = []
+        self._failed_keys = set()
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._api = None
+
+    def get_limiter(self, host):
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = TokenBucket(self.rate, self.burst)
+            return self._limiters[host]
+
+    def sleep_before_retry(self, attempt, retry_after=None):
+        delay = retry_after if retry_after is not None else self.backoff * 2 ** attempt
+        delay = min(delay, self.max_backoff)
+        # Jitter so that concurrent workers do not retry in lockstep
+        time.sleep(delay + random.uniform(0, delay / 2))
+        self.count("retries")
+
+    def count(self, stat):
+        # `+=` on a Counter is not atomic across the enrichment threads
+        with self._lock:
+            self.stats[stat] += 1
+
+    def new_session(self, pool_maxsize=None):
+        session = requests.Session()
+        adapter = RateLimitedRetryAdapter(self, pool_connections=4, pool_maxsize=pool_maxsize or self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return get_profiler().instrument_session(session)
+
+    def install(self):
+        from huggingface_hub import configure_http_backend
+        configure_http_backend(backend_factory=self.new_session)
+        return self
+
+    @property
+    def api(self):
+        if self._api is None:
+            from huggingface_hub import HfApi
+            self._api = HfApi()
+        return self._api
+
+    def record_failure(self, lookup, key, error):
+        with self._lock:
+            self.failures.append((lookup, key, f"{type(error).__name__}: {error}"))
+            self._failed_keys.add(key)
+
+    def has_failed(self, key):
+        return key in self._failed_keys
+
+    def summary(self):
+        lines = [f"Hub client: {self.stats['retries']} retries, {self.stats['throttled']} throttled responses, {len(self.failures)} failed lookups"]
+        for lookup, count in Counter(lookup for lookup, _, _ in self.failures).most_common():
+            lines.append(f"  {lookup}: {count} failed (left missing, not counted as zero)")
+        return "\n".join(lines)
+
+
+_default_client = None
+
+
+def configure_hub_client(rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=DEFAULT_MAX_RETRIES, **kwargs):
+    """
+    Creates the shared client and routes `huggingface_hub` calls through it.
+    """
+    global _default_client
+    _default_client = HubClient(rate=rate, burst=burst, max_retries=max_retries, **kwargs).install()
+    return _default_client
+
+
+def get_hub_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = HubClient().install()
+    return _default_client
@@ -0,0 +1,333 @@
+import gzip
+import json
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+
+DEFAULT_MODEL_INDEX_PATH = "model_index.json.gz"
+DEFAULT_SPACE_INDEX_PATH = "space_index.json.gz"
+DEFAULT_DATASET_INDEX_PATH = "dataset_index.json.gz"
+
+# The Arabic dataset index is refreshed when older than this
+DEFAULT_DATASET_INDEX_MAX_AGE = 24 * 3600
+
+
+class DatasetUsageIndex:
+    """
+    Persistent map of Hub repos to the datasets they reference (or, for
+    `ArabicDatasetIndex`, to their tags), built from a single walk of a repo
+    listing and counted per value.
+
+    The listing is walked newest-first by lastModified, so `refresh()` only
+    pages through repos modified since the previous build. Repos deleted on the
+    Hub are only dropped by a full rebuild (`refresh(full=True)`).
+    Subclasses implement `_list_repos()` and `_datasets_of(repo)`.
+    """
+
+    kind = None
+
+    def __init__(self, path):
+        self.path = path
+        self.repos = {}
+        self.last_modified = None
+        self.built_at = None
+        self._counts = None
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def _list_repos(self):
+        raise NotImplementedError
+
+    def _datasets_of(self, repo):
+        raise NotImplementedError
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            self._restore(json.load(f))
+
+    def _restore(self, data):
+        self.repos = data["repos"]
+        self.last_modified = data["last_modified"]
+        self.built_at = data["built_at"]
+        self._counts = None
+
+    def _dump(self):
+        return {
+            "kind": self.kind,
+            "built_at": self.built_at,
+            "last_modified": self.last_modified,
+            "repos": self.repos,
+        }
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(self._dump(), f)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def is_built(self):
+        return self.built_at is not None
+
+    def refresh(self, full=False):
+        """
+        Walks the listing (only the part modified since the last build unless
+        `full`) and saves the index. Returns the number of repos walked.
+        """
+        incremental = self.is_built and not full
+        if not incremental:
+            self.repos = {}
+
+        walked = 0
+        newest = None
+        for repo in self._list_repos():
+            repo_modified = repo.last_modified.isoformat() if repo.last_modified else None
+            if incremental and repo_modified and self.last_modified and repo_modified <= self.last_modified:
+                break
+
+            walked += 1
+            if newest is None and repo_modified:
+                newest = repo_modified
+
+            datasets = self._datasets_of(repo)
+            if datasets:
+                self.repos[repo.id] = sorted(set(datasets))
+            else:
+                self.repos.pop(repo.id, None)
+
+        self.last_modified = newest or self.last_modified
+        self.built_at = datetime.now(timezone.utc).isoformat()
+        self._counts = None
+        if self.path:
+            self.save()
+        return walked
+
+    @property
+    def age(self):
+        """
+        Seconds since the index was last built or refreshed (None if never).
+        """
+        if self.built_at is None:
+            return None
+        return (datetime.now(timezone.utc) - datetime.fromisoformat(self.built_at)).total_seconds()
+
+    def describe(self):
+        return f"{len(self.counts())} datasets referenced"
+
+    def counts(self):
+        if self._counts is None:
+            self._counts = Counter(dataset for datasets in self.repos.values() for dataset in datasets)
+        return self._counts
+
+    def count(self, dataset_id):
+        return self.counts().get(dataset_id, 0)
+
+
+class ModelCountIndex(DatasetUsageIndex):
+    """
+    dataset id -> number of models whose `dataset:` tags reference it, for the
+    datasets counted so far. Matches `len(list(list_models(filter=f"dataset:{dataset_id}")))`.
+
+    There are far more models on the Hub than Arabic datasets, so the listing
+    is never walked in full: a dataset not yet in the index is counted with
+    its own `list_models` call and its models are added (`add`), and a refresh
+    only walks the models modified since the previous one, keeping those that
+    reference a counted dataset.
+    """
+
+    kind = "models"
+
+    def __init__(self, path):
+        self.datasets = set()
+        self._lock = threading.Lock()
+        super().__init__(path)
+
+    def _restore(self, data):
+        super()._restore(data)
+        self.datasets = set(data.get("datasets", []))
+
+    def _dump(self):
+        with self._lock:
+            return {**super()._dump(), "repos": dict(self.repos), "datasets": sorted(self.datasets)}
+
+    def _list_repos(self):
+        from hub_client import get_hub_client
+        return get_hub_client().api.list_models(sort="lastModified", direction=-1, expand=["tags", "lastModified"])
+
+    def _datasets_of(self, repo):
+        datasets = [tag.split(":", 1)[1] for tag in (repo.tags or []) if tag.startswith("dataset:")]
+        return datasets if self.datasets.intersection(datasets) else []
+
+    def refresh(self, full=False):
+        if self.is_built and not full:
+            return super().refresh()
+        # A new index starts empty, with the models modified from now on left to later refreshes
+        self.repos = {}
+        self.datasets = set()
+        self.built_at = self.last_modified = datetime.now(timezone.utc).isoformat()
+        self._counts = None
+        if self.path:
+            self.save()
+        return 0
+
+    def describe(self):
+        return f"{len(self.datasets)} datasets counted"
+
+    def covers(self, dataset_id):
+        return dataset_id in self.datasets
+
+    def add(self, dataset_id, models):
+        """
+        Records the models of `list_models(filter=f"dataset:{dataset_id}")`.
+        Safe to call from the enrichment threads; `save()` persists them.
+        """
+        with self._lock:
+            for model in models:
+                datasets = [tag.split(":", 1)[1] for tag in (model.tags or []) if tag.startswith("dataset:")]
+                self.repos[model.id] = sorted(set(self.repos.get(model.id, [])) | set(datasets) | {dataset_id})
+            self.datasets.add(dataset_id)
+            self._counts = None
+
+    def count(self, dataset_id):
+        with self._lock:
+            return super().count(dataset_id)
+
+
+class SpaceCountIndex(DatasetUsageIndex):
+    """
+    dataset id -> number of Spaces that list it in their `datasets`.
+    Matches `len(list(HfApi().list_spaces(datasets=dataset_id)))`.
+    """
+
+    kind = "spaces"
+
+    def _list_repos(self):
+        from hub_client import get_hub_client
+        return get_hub_client().api.list_spaces(sort="lastModified", direction=-1, expand=["datasets", "lastModified"])
+
+    def _datasets_of(self, repo):
+        return repo.datasets or []
+
+
+class ArabicDatasetIndex(DatasetUsageIndex):
+    """
+    Arabic dataset id -> tags, so keyword fallbacks match locally instead of
+    listing every Arabic dataset again. Use `match(matcher)` to query it.
+    """
+
+    kind = "datasets"
+
+    def _list_repos(self):
+        from hub_client import get_hub_client
+        return get_hub_client().api.list_datasets(language="ar", sort="lastModified", direction=-1)
+
+    def _datasets_of(self, repo):
+        return repo.tags or []
+
+    def describe(self):
+        return f"{len(self.repos)} datasets indexed"
+
+    def match(self, matcher):
+        """
+        Sorted ids of the indexed datasets accepted by a `KeywordMatcher`.
+        """
+        return sorted(dataset_id for dataset_id, tags in self.repos.items() if matcher.matches(dataset_id, tags))
+
+
+def get_doi_from_tags(tags):
+    """
+    DOI tag of a dataset (e.g. `doi:10.57967/hf/1234`) as a one-item list, or "none".
+    """
+    doi = next((tag for tag in tags if "doi" in tag), None)
+    return [doi] if doi else "none"
+
+
+class KeywordMatcher:
+    """
+    Precompiled keyword fallback for a category. A dataset matches when it has
+    `required_modality` among its tags and either one of `search_keywords`
+    occurs in its id (case-insensitive substring) or it carries one of
+    `required_tags`, as a whole tag or as the value after `<prefix>:`.
+    """
+
+    def __init__(self, search_keywords, required_tags=(), required_modality=None):
+        keywords = [re.escape(keyword.lower()) for keyword in search_keywords if keyword]
+        self.pattern = re.compile("|".join(keywords)) if keywords else None
+        self.required_tags = {tag.lower() for tag in required_tags or ()}
+        self.required_modality = required_modality
+
+    def matches(self, dataset_id, tags):
+        tags = tags or []
+        if self.required_modality and self.required_modality not in tags:
+            return False
+        if self.pattern is not None and self.pattern.search(dataset_id.lower()):
+            return True
+        if self.required_tags:
+            return any(tag.lower() in self.required_tags or tag.lower().split(":", 1)[-1] in self.required_tags for tag in tags)
+        return False
+
+
+def open_index(index_class, path, rebuild=False, refresh=True, max_age=None, offline=False):
+    """
+    Loads an index from `path` and, unless `refresh` is False and it is already
+    built, brings it up to date with the Hub. With `max_age` (seconds), an
+    index refreshed more recently than that is used as is. With `offline`, the
+    index is only read, and a missing one raises FileNotFoundError.
+    """
+    index = index_class(path)
+    if offline:
+        if not index.is_built:
+            raise FileNotFoundError(f"No {index.kind} index at {path}")
+        return index
+    if refresh and max_age is not None and index.is_built and index.age <= max_age:
+        refresh = False
+    if rebuild or not index.is_built or refresh:
+        action = "Building" if rebuild or not index.is_built else "Refreshing"
+        print(f"{action} {index.kind} index {path} ...")
+        walked = index.refresh(full=rebuild)
+        print(f"{index.kind.capitalize()} index: {walked} {index.kind} walked, {index.describe()}")
+    return index
+
+
+_model_index = None
+
+
+def configure_model_index(path=DEFAULT_MODEL_INDEX_PATH, rebuild=False, refresh=True):
+    """
+    Loads the model index used by `script.get_models_count` and brings it up to
+    date; datasets it has not counted yet are looked up and added. Pass path=None to go back to one `list_models` call per dataset.
+    """
+    global _model_index
+    _model_index = open_index(ModelCountIndex, path, rebuild, refresh) if path else None
+    return _model_index
+
+
+def get_model_index():
+    return _model_index
+
+
+_dataset_index_settings = {"path": None}
+_dataset_index = None
+
+
+def configure_dataset_index(path=DEFAULT_DATASET_INDEX_PATH, rebuild=False, max_age=DEFAULT_DATASET_INDEX_MAX_AGE):
+    """
+    Sets the Arabic dataset index used by `script.get_arabic_datasets_by_keywords`.
+    It is only opened on first use, and refreshed then when older than
+    `max_age` seconds. Pass path=None to list Arabic datasets on every fallback.
+    """
+    global _dataset_index
+    _dataset_index_settings.update(path=path, rebuild=rebuild, max_age=max_age)
+    _dataset_index = None
+
+
+def get_dataset_index():
+    global _dataset_index
+    settings = _dataset_index_settings
+    if _dataset_index is None and settings["path"]:
+        _dataset_index = open_index(ArabicDatasetIndex, settings["path"], rebuild=settings["rebuild"], max_age=settings["max_age"])
+    return _dataset_index
@@ -0,0 +1,139 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_CACHE_PATH = "metadata_cache.sqlite"
+DEFAULT_TTL_DAYS = 7
+DEFAULT_MAX_ENTRIES = 100000
+
+
+class MetadataCache:
+    """
+    On-disk SQLite cache of per-dataset enrichment results.
+
+    Entries are keyed by dataset id and only served while the dataset's
+    `lastModified` is unchanged and the entry is younger than `ttl` seconds.
+    Once more than `max_entries` are stored, the least recently used ones are
+    evicted.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL_DAYS * 24 * 3600, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "expired": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                dataset_id TEXT PRIMARY KEY,
+                last_modified TEXT,
+                record TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS records_accessed_at ON records (accessed_at)")
+        self._conn.commit()
+
+    def get(self, dataset_id, last_modified):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_modified, record, stored_at FROM records WHERE dataset_id = ?",
+                (dataset_id,),
+            ).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            cached_last_modified, record, stored_at = row
+            if cached_last_modified != _key(last_modified):
+                self.stats["misses"] += 1
+                self.stats["stale"] += 1
+                return None
+            if self.ttl is not None and now - stored_at > self.ttl:
+                self.stats["misses"] += 1
+                self.stats["expired"] += 1
+                return None
+
+            self._conn.execute("UPDATE records SET accessed_at = ? WHERE dataset_id = ?", (now, dataset_id))
+            self._conn.commit()
+            self.stats["hits"] += 1
+            return json.loads(record)
+
+    def put(self, dataset_id, last_modified, record):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)",
+                (dataset_id, _key(last_modified), json.dumps(record, default=str), now, now),
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """
+        Drops expired entries, then the least recently used ones above `max_entries`.
+        """
+        with self._lock:
+            evicted = 0
+            if self.ttl is not None:
+                evicted += self._conn.execute(
+                    "DELETE FROM records WHERE stored_at < ?", (time.time() - self.ttl,)
+                ).rowcount
+            if self.max_entries is not None:
+                evicted += self._conn.execute(
+                    """
+                    DELETE FROM records WHERE dataset_id IN (
+                        SELECT dataset_id FROM records ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+            self.stats["evicted"] += evicted
+        return evicted
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0.0
+        return (
+            f"Cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({self.stats['stale']} modified, {self.stats['expired']} expired), "
+            f"{hit_rate:.1f}% hit rate, {self.stats['evicted']} evicted, {len(self)} entries in {self.path}"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _key(last_modified):
+    return None if last_modified is None else str(last_modified)
+
+
+_default_cache = None
+
+
+def configure_metadata_cache(path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL_DAYS * 24 * 3600, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Sets the cache used by `script.enrich_datasets`. Pass path=None to disable caching.
+    """
+    global _default_cache
+    if _default_cache is not None:
+        _default_cache.close()
+    _default_cache = MetadataCache(path, ttl=ttl, max_entries=max_entries) if path else None
+    return _default_cache
+
+
+def get_metadata_cache():
+    return _default_cache
@@ -0,0 +1,221 @@
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+
+# Upper bounds (seconds) of the wall time histogram buckets
+HISTOGRAM_BUCKETS = (0.01, 0.1, 1, 10, float("inf"))
+
+# Path patterns collapsed so that calls are grouped per endpoint, not per dataset
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/api/(datasets|models|spaces)/[^?]+?/(paths-info|tree|revision)/.*$"), r"/api/\1/{id}/\2/*"),
+    (re.compile(r"^/api/(datasets|models|spaces)/[^/?]+/[^/?]+$"), r"/api/\1/{id}"),
+    (re.compile(r"^/api/(datasets|models|spaces)/[^/?]+$"), r"/api/\1/{id}"),
+    (re.compile(r"^/datasets/[^/]+/[^/]+/resolve/[^/]+/(.+)$"), r"/datasets/{id}/resolve/{revision}/\1"),
+    (re.compile(r"^/datasets/[^/]+/resolve/[^/]+/(.+)$"), r"/datasets/{id}/resolve/{revision}/\1"),
+    (re.compile(r"^/datasets/[^/?]+(/[^/?]+)?$"), r"/datasets/{id}"),
+]
+
+
+def endpoint_name(method, url):
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            path = pattern.sub(replacement, path)
+            break
+    return f"{method} {parts.netloc}{path}"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class Profiler:
+    """
+    Collects per-stage wall times, external calls per endpoint (count, bytes,
+    errors, time) and the total time spent per dataset.
+
+    When disabled every method returns immediately, so instrumented code pays
+    one attribute check.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = defaultdict(list)
+        self.calls = defaultdict(lambda: {"calls": 0, "bytes": 0, "errors": 0, "seconds": 0.0})
+        self.datasets = defaultdict(float)
+
+    def stage(self, name, key=None):
+        """
+        Context manager timing one run of stage `name`, attributed to dataset `key`.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name, key)
+
+    @contextmanager
+    def _timed(self, name, key):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start, key)
+
+    def record_stage(self, name, seconds, key=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.stages[name].append(seconds)
+            if key is not None:
+                self.datasets[key] += seconds
+
+    def wrap(self, name, fn):
+        """
+        `fn(item)` timed as stage `name`, keyed by `item.id` when it has one.
+        """
+        if not self.enabled:
+            return fn
+
+        def timed(item):
+            with self._timed(name, getattr(item, "id", None)):
+                return fn(item)
+        return timed
+
+    def record_call(self, endpoint, nbytes=0, seconds=0.0, error=False):
+        if not self.enabled:
+            return
+        with self._lock:
+            call = self.calls[endpoint]
+            call["calls"] += 1
+            call["bytes"] += nbytes
+            call["errors"] += int(error)
+            call["seconds"] += seconds
+
+    def _response_hook(self, response, *args, **kwargs):
+        nbytes = response.headers.get("Content-Length") if response.request.method != "HEAD" else 0
+        if nbytes is None and not kwargs.get("stream"):
+            # Read anyway by requests right after the hook for non-streamed calls
+            nbytes = len(response.content)
+        self.record_call(
+            endpoint_name(response.request.method, response.url),
+            int(nbytes or 0),
+            response.elapsed.total_seconds(),
+            error=response.status_code >= 400,
+        )
+
+    def instrument_session(self, session):
+        """
+        Records every response of a `requests.Session` as an external call.
+        """
+        if self.enabled:
+            session.hooks["response"].append(self._response_hook)
+        return session
+
+    def instrument_hub(self):
+        """
+        Instruments the sessions `huggingface_hub` creates for its API calls and downloads.
+        """
+        # The shared Hub client instruments each session it creates with the
+        # current profiler; re-installing it drops the sessions created before
+        from hub_client import get_hub_client
+        get_hub_client().install()
+
+    def export(self):
+        """
+        Raw stage times, calls and per-dataset times, for `merge` in another
+        process (e.g. a worker's profile into its parent's).
+        """
+        with self._lock:
+            return {
+                "stages": {name: list(durations) for name, durations in self.stages.items()},
+                "calls": {endpoint: dict(call) for endpoint, call in self.calls.items()},
+                "datasets": dict(self.datasets),
+            }
+
+    def merge(self, exported):
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, durations in exported["stages"].items():
+                self.stages[name].extend(durations)
+            for endpoint, call in exported["calls"].items():
+                for field, value in call.items():
+                    self.calls[endpoint][field] += value
+            for key, seconds in exported["datasets"].items():
+                self.datasets[key] += seconds
+
+    def to_dict(self, top=10):
+        with self._lock:
+            stages = {}
+            for name, durations in self.stages.items():
+                ordered = sorted(durations)
+                histogram, lower = {}, 0
+                for upper in HISTOGRAM_BUCKETS:
+                    label = f"<{upper}s" if upper != float("inf") else f">={lower}s"
+                    histogram[label] = sum(lower <= d < upper for d in ordered)
+                    lower = upper
+                stages[name] = {
+                    "count": len(ordered),
+                    "total_s": sum(ordered),
+                    "mean_s": sum(ordered) / len(ordered),
+                    "p50_s": percentile(ordered, 0.5),
+                    "p95_s": percentile(ordered, 0.95),
+                    "max_s": ordered[-1],
+                    "histogram": histogram,
+                }
+            slowest = sorted(self.datasets.items(), key=lambda item: item[1], reverse=True)[:top]
+            return {
+                "wall_time_s": time.perf_counter() - self.started_at,
+                "stages": stages,
+                "calls": {endpoint: dict(call) for endpoint, call in sorted(self.calls.items())},
+                "slowest_datasets": [{"dataset_id": key, "seconds": seconds} for key, seconds in slowest],
+            }
+
+    def summary(self, top=10):
+        report = self.to_dict(top)
+        lines = [f"Profile ({report['wall_time_s']:.1f} s wall time)", "", "Stages:"]
+        for name, stage in sorted(report["stages"].items(), key=lambda item: item[1]["total_s"], reverse=True):
+            histogram = " ".join(f"{label}:{count}" for label, count in stage["histogram"].items())
+            lines.append(
+                f"  {name:<28} n={stage['count']:<6} total={stage['total_s']:8.2f}s mean={stage['mean_s']:.3f}s "
+                f"p50={stage['p50_s']:.3f}s p95={stage['p95_s']:.3f}s max={stage['max_s']:.3f}s  [{histogram}]"
+            )
+        lines += ["", "External calls:"]
+        for endpoint, call in report["calls"].items():
+            lines.append(f"  {endpoint:<70} calls={call['calls']:<6} errors={call['errors']:<4} bytes={call['bytes']:<12} time={call['seconds']:.2f}s")
+        if report["slowest_datasets"]:
+            lines += ["", f"Slowest datasets (top {top}):"]
+            lines += [f"  {item['seconds']:8.2f}s  {item['dataset_id']}" for item in report["slowest_datasets"]]
+        return "\n".join(lines)
+
+    def dump(self, path, top=10):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(top), f, indent=2)
+
+
+_default_profiler = Profiler(enabled=False)
+
+
+def configure_profiler(enabled=True, instrument_hub=True):
+    """
+    Turns profiling on (or off) for this process. When enabled, Hub API calls
+    and downloads are recorded too unless `instrument_hub` is False.
+    """
+    global _default_profiler
+    _default_profiler = Profiler(enabled=enabled)
+    if enabled and instrument_hub:
+        _default_profiler.instrument_hub()
+    return _default_profiler
+
+
+def get_profiler():
+    return _default_profiler
@@ -0,0 +1,120 @@
+import re
+from collections import namedtuple
+
+
+# Feature -> keywords that reveal it (case-insensitive substring match)
+DOCUMENTATION_FEATURES = {
+    "usage": ("usage", "how to use"),
+    "license": ("license",),
+    "examples": ("example", "examples"),
+    "citation": ("citation", "how to cite"),
+    "description": ("description", "overview"),
+    "authors": ("author", "maintainer"),
+}
+
+ANNOTATION_FEATURES = {
+    "task": ("task categories", "task_categories"),
+    "language": ("language",),
+    "size": ("size categories", "size_categories"),
+    "license": ("license",),
+    "source": ("dataset source", "source_datasets"),
+    "configs": ("configs", "dataset_info"),
+}
+
+# Annotation feature -> card data (README front matter) fields that reveal it
+CARD_ANNOTATION_FIELDS = {
+    "task": ("task_categories",),
+    "language": ("language",),
+    "size": ("size_categories",),
+    "license": ("license",),
+    "source": ("source_datasets",),
+    "configs": ("configs", "dataset_info"),
+}
+
+ACL_MATCHER = re.compile(r"https?://aclanthology\.org/\S+")
+# Starts with a literal so `re` can skip ahead quickly; word boundaries are checked afterwards
+DOI_MATCHER = re.compile(r"10\.\d{4,9}/[^\s\"'<>\])}]+")
+
+ReadmeAnalysis = namedtuple(
+    "ReadmeAnalysis",
+    ["features", "documentation_score", "annotation_score", "acl_links", "doi_mentions"],
+)
+
+
+def analyze_readme(readme_text):
+    """
+    Analyzes a README once and returns the documentation/annotation feature
+    flags, both scores, the ACL Anthology links and the DOIs mentioned in it.
+    """
+    # Lowercase once and test each feature's keywords with plain substring
+    # scans, which CPython runs far faster than a combined `re` alternation
+    text = readme_text.lower()
+    found = {
+        feature
+        for features in (DOCUMENTATION_FEATURES, ANNOTATION_FEATURES)
+        for feature, keywords in features.items()
+        if any(keyword in text for keyword in keywords)
+    }
+
+    features = {f"documentation_{feature}": feature in found for feature in DOCUMENTATION_FEATURES}
+    features.update({f"annotation_{feature}": feature in found for feature in ANNOTATION_FEATURES})
+
+    return ReadmeAnalysis(
+        features,
+        sum(feature in found for feature in DOCUMENTATION_FEATURES),
+        sum(feature in found for feature in ANNOTATION_FEATURES),
+        ACL_MATCHER.findall(readme_text),
+        find_dois(readme_text),
+    )
+
+
+def get_card_annotation_score(card_data):
+    """
+    Annotation score from a dataset's card data (the README YAML front matter
+    as a dict, e.g. from `list_datasets(expand=["cardData"])`): the number of
+    annotation features with a non-empty field. Unlike `analyze_readme`, words
+    in the README body do not count.
+    """
+    card_data = card_data or {}
+    return sum(
+        any(card_data.get(field) not in (None, "", [], {}) for field in fields)
+        for fields in CARD_ANNOTATION_FIELDS.values()
+    )
+
+
+def find_dois(text):
+    dois = []
+    for match in DOI_MATCHER.finditer(text):
+        start = match.start()
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] in "._"):
+            continue
+        doi = match.group().rstrip(".,;:")
+        if doi not in dois:
+            dois.append(doi)
+    return dois
+
+
+def analyze_readmes(readme_texts):
+    """
+    Batch version of `analyze_readme` for a column of READMEs. Each distinct
+    README is scanned once; rows without a README (not a string) get None.
+    Returns a DataFrame with the scores, ACL links and DOI mentions per row.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(readme_texts)
+    analyses = [analyze_readme(text) if isinstance(text, str) else None for text in uniques]
+
+    def column(field):
+        values = [getattr(analysis, field) if analysis is not None else None for analysis in analyses]
+        return [values[code] if code >= 0 else None for code in codes]
+
+    return pd.DataFrame(
+        {
+            "documentation_score": column("documentation_score"),
+            "annotation_score": column("annotation_score"),
+            "acl_links": column("acl_links"),
+            "doi_mentions": column("doi_mentions"),
+        },
+        index=readme_texts.index,
+    )
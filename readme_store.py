@@ -0,0 +1,155 @@
+import os
+import sys
+import gzip
+import getopt
+import hashlib
+from functools import lru_cache
+
+
+DEFAULT_README_STORE = "readmes"
+
+# Rows whose README could not be fetched keep this marker instead of a hash
+MISSING_README = "none"
+
+
+def get_readme_hash(readme_text):
+    return hashlib.sha256(readme_text.encode("utf-8")).hexdigest()
+
+
+class ReadmeStore:
+    """
+    Content-addressed store of README texts: each distinct README is written
+    once under `<root>/<hash[:2]>/<hash>.md[.gz]`, where hash is its SHA-256.
+    """
+
+    def __init__(self, root=DEFAULT_README_STORE, compress=True):
+        self.root = root
+        self.compress = compress
+        self.get = lru_cache(maxsize=256)(self._read)
+
+    def _path(self, readme_hash, compressed):
+        extension = ".md.gz" if compressed else ".md"
+        return os.path.join(self.root, readme_hash[:2], readme_hash + extension)
+
+    def __contains__(self, readme_hash):
+        return os.path.exists(self._path(readme_hash, True)) or os.path.exists(self._path(readme_hash, False))
+
+    def put(self, readme_text):
+        if readme_text == MISSING_README:
+            return MISSING_README
+
+        readme_hash = get_readme_hash(readme_text)
+        if readme_hash in self:
+            return readme_hash
+
+        path = self._path(readme_hash, self.compress)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data = readme_text.encode("utf-8")
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(data) if self.compress else data)
+        os.replace(tmp_path, path)
+        return readme_hash
+
+    def _read(self, readme_hash):
+        """
+        Loads a README by hash. Returns None for rows without a README.
+        """
+        if not isinstance(readme_hash, str):
+            return None
+        if readme_hash == MISSING_README:
+            return MISSING_README
+
+        compressed_path = self._path(readme_hash, True)
+        if os.path.exists(compressed_path):
+            with gzip.open(compressed_path, "rt", encoding="utf-8") as f:
+                return f.read()
+        with open(self._path(readme_hash, False), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def load_column(self, readme_hashes):
+        """
+        Lazily loaded README texts for a column of hashes.
+        """
+        return readme_hashes.map(self.get)
+
+
+_default_store = None
+
+
+def configure_readme_store(root=DEFAULT_README_STORE, compress=True):
+    """
+    Sets the store used by `script.py`. Pass root=None to keep README texts inline.
+    """
+    global _default_store
+    _default_store = ReadmeStore(root, compress=compress) if root else None
+    return _default_store
+
+
+def get_readme_store():
+    return _default_store
+
+
+def externalize_readmes(df, store):
+    """
+    Replaces the `README file` column of an extracted frame with `README Hash`
+    plus the precomputed README scores.
+    """
+    from readme_analysis import analyze_readmes
+
+    analysis = analyze_readmes(df['README file'])
+    position = df.columns.get_loc('README file')
+
+    df = df.copy()
+    df.insert(position, 'README Hash', df['README file'].map(lambda x: store.put(x) if isinstance(x, str) else None))
+    df = df.drop(columns=['README file'])
+    df['README Quality Score'] = analysis['documentation_score']
+    df['README Annotation Score'] = analysis['annotation_score']
+    return df
+
+
+def main(argv):
+    store_root = DEFAULT_README_STORE
+    compress = True
+    csv_file = None
+    out_file = None
+    readme_hash = None
+
+    try:
+        opts, _ = getopt.getopt(argv, "f:o:", ["file=", "out=", "store=", "no-compress", "show="])
+    except getopt.GetoptError:
+        print("Usage: python readme_store.py -f <csvfile> [-o <outfile>] [--store <dir>] [--no-compress] | --show <hash>")
+        sys.exit(2)
+
+    for opt, arg in opts:
+        if opt in ("-f", "--file"):
+            csv_file = arg
+        elif opt in ("-o", "--out"):
+            out_file = arg
+        elif opt == "--store":
+            store_root = arg
+        elif opt == "--no-compress":
+            compress = False
+        elif opt == "--show":
+            readme_hash = arg
+
+    store = ReadmeStore(store_root, compress=compress)
+
+    if readme_hash:
+        print(store.get(readme_hash))
+        return
+
+    if not csv_file:
+        print("CSV file is required. Usage: python readme_store.py -f <csvfile> [-o <outfile>] [--store <dir>] [--no-compress] | --show <hash>")
+        sys.exit(2)
+
+    import pandas as pd
+
+    df = externalize_readmes(pd.read_csv(csv_file), store)
+    out_file = out_file or csv_file.replace(".csv", "_readme_hashes.csv")
+    df.to_csv(out_file, index=False)
+    print(f"{df['README Hash'].nunique()} distinct READMEs stored in {store_root}, rows saved to {out_file}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
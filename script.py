@@ -1,87 +1,46 @@
-import re
-import time
 import sys
 import getopt
-import yaml
-import pandas as pd
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from huggingface_hub import list_datasets, list_models, hf_hub_download
-
-from huggingface_hub.utils import logging
-logging.set_verbosity_error()
-
-
-def covert_sizes_to_bytes(size):
-    pattern = r'(\d+(?:\.\d+)?)\s*(KB|MB|GB|TB)'
-    matches = re.findall(pattern, size, flags=re.IGNORECASE)
-
-    size_map = {
-        'KB': 1024,
-        'MB': 1024 ** 2,
-        'GB': 1024 ** 3,
-        'TB': 1024 ** 4
-    }
-
-    for value, unit in matches:
-        unit_upper = unit.upper()
-        bytes_size = float(value) * size_map[unit_upper]
-
-    return bytes_size
-
-
-
-def get_page_source(url):
-    CHROMEDRIVER_PATH = "/opt/homebrew/bin/chromedriver"
-
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    service = Service(CHROMEDRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.implicitly_wait(10)
+from datetime import datetime
+
+from categories import (
+    DEFAULT_KEYWORDS_MAP_PATH, DEFAULT_TASK_MAPPING_PATH, load_keywords_map, load_task_mapping,
+)
+from hub_client import DEFAULT_MAX_RETRIES, DEFAULT_RATE, configure_hub_client, get_hub_client
+from browser_pool import configure_browser_pool, fetch_page_source
+from enrichment import BACKENDS, configure_enrichment_engine, get_enrichment_engine
+from readme_analysis import analyze_readme, get_card_annotation_score
+from readme_store import configure_readme_store, get_readme_store
+from profiling import configure_profiler, get_profiler
+from extraction_journal import configure_extraction_journal, get_extraction_journal, get_journal_path
+from hub_index import (
+    DEFAULT_DATASET_INDEX_PATH, DEFAULT_MODEL_INDEX_PATH, KeywordMatcher,
+    configure_dataset_index, configure_model_index, get_dataset_index, get_doi_from_tags, get_model_index,
+)
+from metadata_cache import (
+    DEFAULT_CACHE_PATH, DEFAULT_TTL_DAYS, DEFAULT_MAX_ENTRIES,
+    configure_metadata_cache, get_metadata_cache,
+)
+from size_providers import (
+    SIZE_BACKENDS, UNKNOWN_SIZE_INFO, format_size,
+    configure_size_provider, get_default_size_provider,
+)
+
+
+def get_page_source(url, pool=None):
+    return fetch_page_source(url, pool=pool)
 
-    try:
-        # Go directly to the dataset page
-        driver.get(url)
-        time.sleep(3)
-
-
-        return driver.page_source
-
-    finally:
-        driver.quit()
 
 def get_readme_score(readme_text):
-
-    text = readme_text.lower()
-
-    # Define feature flags
-    has_usage = "usage" in text or "how to use" in text
-    has_license = "license" in text
-    has_examples = "example" in text or "examples" in text
-    has_citation = "citation" in text or "how to cite" in text
-    has_description = "description" in text or "overview" in text
-    has_authors = "author" in text or "maintainer" in text
-
-    # Count how many indicators are present
-    score = sum([has_usage, has_license, has_examples, has_citation, has_description, has_authors])
-
-    return score
+    return analyze_readme(readme_text).documentation_score
 
 
 
-def classify_readme_level(readme_text):
+def classify_readme_level(readme_text, score=None):
     if not isinstance(readme_text, str) or len(readme_text.strip()) < 20:
         return "Low"
 
-    score = get_readme_score(readme_text)
+    if score is None:
+        score = get_readme_score(readme_text)
     
     # Classification logic
     if score >= 4:
@@ -92,121 +51,283 @@ def classify_readme_level(readme_text):
         return "Low"
 
 
-def get_dataset_size_info(dataset_name):
-    url = f"https://huggingface.co/datasets/{dataset_name}"
-   
-    
+def get_dataset_size_info(dataset_name, provider=None):
+    provider = provider or get_default_size_provider()
+
     try:
-        page_source = get_page_source(url)        
-        soup = BeautifulSoup(page_source, 'html.parser')
-
-        Size_of_downloaded_dataset_files = soup.find_all('a', class_='bg-linear-to-r dark:via-none group mb-1.5 flex max-w-full flex-col overflow-hidden rounded-lg border border-gray-100 from-white via-white to-white px-2 py-1 hover:from-gray-50 dark:from-gray-900 dark:to-gray-925 dark:hover:to-gray-900 md:mr-1.5 pointer-events-none')
-        Size_of_downloaded_dataset_files_str = Size_of_downloaded_dataset_files[0].text.strip("Size of downloaded dataset files:").strip("\n")
-        Size_of_downloaded_dataset_files_bytes = covert_sizes_to_bytes(Size_of_downloaded_dataset_files_str)
-        
-        
-        Size_of_the_auto_converted_Parquet_files = soup.find_all('div', class_='truncate text-sm group-hover:underline')
-        Size_of_the_auto_converted_Parquet_files_str = Size_of_the_auto_converted_Parquet_files[-1].text.strip()
-        Size_of_the_auto_converted_Parquet_files_bytes = covert_sizes_to_bytes(Size_of_the_auto_converted_Parquet_files_str)
-        
-
-        Number_of_rows = soup.find_all('a', class_='bg-linear-to-r dark:via-none group mb-1.5 flex max-w-full flex-col overflow-hidden rounded-lg border border-gray-100 from-white via-white to-white px-2 py-1 hover:from-gray-50 dark:from-gray-900 dark:to-gray-925 dark:hover:to-gray-900 md:mr-1.5 pointer-events-none')
-        Number_of_rows = Number_of_rows[1].text.strip("Number of rows:").strip("\n")
-        Number_of_rows = Number_of_rows.strip(",").replace(",", "")    
-       
-
-        return Size_of_downloaded_dataset_files_str, Size_of_downloaded_dataset_files_bytes, Size_of_the_auto_converted_Parquet_files_str, Size_of_the_auto_converted_Parquet_files_bytes, Number_of_rows
-    
-    except IndexError:
-        return "unknown", "unknown", "unknown", "unknown", "unknown"
-    
-    except UnboundLocalError:
-        return "unknown", "unknown", "unknown", "unknown", "unknown"
+        return provider.get_size_info(dataset_name)
 
     except Exception as e:
-        print(f"Error processing {dataset_name}: {e}")
-        return "unknown", "unknown", "unknown", "unknown", "unknown"#
+        get_hub_client().record_failure("sizes", dataset_name, e)
+        return UNKNOWN_SIZE_INFO
+
+
+def get_size_columns(size_info):
+    # Missing values keep the "unknown" markers used in the existing CSVs
+    def or_unknown(value):
+        return "unknown" if value is None else value
+
+    return {
+        "Size of downloaded files": format_size(size_info.download_size_bytes),
+        "Size of downloaded files in bytes": or_unknown(size_info.download_size_bytes),
+        "Size of Parquet files": format_size(size_info.parquet_size_bytes),
+        "Size of Parquet files in bytes": or_unknown(size_info.parquet_size_bytes),
+        "Number of Rows": or_unknown(size_info.num_rows),
+    }
 
 
 def get_dataset_readme(dataset_id):
-    readme_path = hf_hub_download(repo_id=dataset_id, repo_type="dataset", filename="README.md")
+    readme_path = get_hub_client().api.hf_hub_download(repo_id=dataset_id, repo_type="dataset", filename="README.md")
     with open(readme_path, "r", encoding="utf-8") as f:
         readme_content = f.read()
     return readme_content
 
 
 def extract_acl_links(readme_content):
-    acl_pattern = r"https?://aclanthology\.org/\S+"
-    return re.findall(acl_pattern, readme_content)
+    return analyze_readme(readme_content).acl_links
 
 
 
-def get_arabic_datasets_by_task_categories(task_mapping):
+def get_dataset_license(tags, marker="license"):
+    try:
+        return [tag for tag in tags if marker in tag][0].split(":")[-1]
+    except (IndexError, TypeError):
+        return "none"
+
+
+def get_arxiv_link(tags):
+    arxiv_link = next((tag.split(":", 1)[-1] for tag in tags if tag.startswith("arxiv:")), "none")
+    if arxiv_link != "none":
+        arxiv_link = "https://arxiv.org/abs/"+arxiv_link
+    return arxiv_link
+
+
+def get_models_count(dataset_id):
+    model_index = get_model_index()
+    if model_index is not None and model_index.covers(dataset_id):
+        return model_index.count(dataset_id)
+
+    client = get_hub_client()
+    try:
+        models = list(client.api.list_models(filter=f"dataset:{dataset_id}"))
+    except Exception as e:
+        # "none" (not 0) so a failed count is not mistaken for a dataset without models
+        client.record_failure("models", dataset_id, e)
+        return "none"
+    if model_index is not None:
+        model_index.add(dataset_id, models)
+    return len(models)
+
+
+def get_readme_columns(dataset_id):
+    from huggingface_hub.utils import EntryNotFoundError, RepositoryNotFoundError
+
+    try:
+        readme = get_dataset_readme(dataset_id)
+        if len(readme) == 0:
+            readme = "none" 
+    except (EntryNotFoundError, RepositoryNotFoundError):
+        readme = "none"
+    except Exception as e:
+        get_hub_client().record_failure("readme", dataset_id, e)
+        readme = "none"
+
+    analysis = analyze_readme(readme)
+    acl_links = analysis.acl_links or "none"
+
+    return {
+        "ACL Paper": acl_links,
+        "README file": readme,
+        "README Quality Level": classify_readme_level(readme, analysis.documentation_score),
+        "README Quality Score": analysis.documentation_score,
+        "README Annotation Score": analysis.annotation_score
+    }
+
+
+def store_readme_columns(readme_columns, store):
+    # Rows carry the README's hash and precomputed scores; the text goes to the store
+    readme = readme_columns["README file"]
+    annotation_score = readme_columns.get("README Annotation Score")
+    if annotation_score is None:
+        annotation_score = analyze_readme(readme).annotation_score
+
+    return {
+        "ACL Paper": readme_columns["ACL Paper"],
+        "README Hash": store.put(readme),
+        "README Quality Level": readme_columns["README Quality Level"],
+        "README Quality Score": readme_columns["README Quality Score"],
+        "README Annotation Score": annotation_score
+    }
+
+
+def get_card_readme_columns(dataset):
+    # Annotation-only runs: scored from the listed card data, no README download
+    card_data = getattr(dataset, "card_data", None)
+    if card_data is not None and not isinstance(card_data, dict):
+        card_data = card_data.to_dict()
+    return {"README Annotation Score": get_card_annotation_score(card_data)}
+
+
+# Per-dataset enrichment stages, keyed by the backend each one talks to
+ENRICHMENT_STAGES = {
+    "hub": lambda dataset: get_models_count(dataset.id),
+    "page": lambda dataset: get_size_columns(get_dataset_size_info(dataset.id)),
+    "readme": lambda dataset: get_readme_columns(dataset.id),
+}
+
+# Fields listed with each dataset in annotation-only runs (expand replaces the defaults)
+CARD_DATA_EXPAND = ["likes", "downloads", "lastModified", "tags", "cardData"]
+
+_annotation_only = False
+
+
+def configure_annotation_only(enabled=True):
+    """
+    Annotation-only runs list the card data of every dataset along with the
+    listing and score annotation from it, instead of downloading each README.
+    Their records have `README Annotation Score` but no README text, quality
+    score or ACL links.
+    """
+    global _annotation_only
+    _annotation_only = enabled
+
+
+def list_arabic_datasets(**filters):
     from huggingface_hub import list_datasets
+    from huggingface_hub.utils import logging
+
+    logging.set_verbosity_error()
+    expand = CARD_DATA_EXPAND if _annotation_only else None
+    return list(list_datasets(language="ar", expand=expand, **filters))
+
+
+def get_enrichment_stages():
+    if _annotation_only:
+        return {**ENRICHMENT_STAGES, "readme": get_card_readme_columns}
+    return ENRICHMENT_STAGES
+
+
+def get_cached_results(cache, dataset):
+    results = cache.get(dataset.id, dataset.lastModified)
+    # Cached by a run in the other mode: its README columns do not fit this one
+    if results is not None and ("README file" in results["readme"]) == _annotation_only:
+        return None
+    return results
+
+
+def build_dataset_record(dataset, stage_results, license_marker="license"):
+    tags = getattr(dataset, "tags", None) or []
+    readme_columns = stage_results["readme"]
+
+    store = get_readme_store()
+    if "README file" not in readme_columns:
+        readme_columns = {"README Annotation Score": readme_columns["README Annotation Score"]}
+    elif store is not None:
+        readme_columns = store_readme_columns(readme_columns, store)
+    else:
+        readme_columns = {
+            "ACL Paper": readme_columns["ACL Paper"],
+            "README file": readme_columns["README file"],
+            "README Quality Level": readme_columns["README Quality Level"],
+            "README Quality Score": readme_columns["README Quality Score"]
+        }
+
+    return {
+        "Dataset ID": dataset.id,
+        "Likes": dataset.likes,
+        "Downloads": dataset.downloads,
+        "Last Modified": dataset.lastModified,
+        "License": get_dataset_license(tags, license_marker),
+        "Models": stage_results["hub"],
+        **stage_results["page"],
+        "ArXiv Paper": get_arxiv_link(tags),
+        "DOIs": get_doi_from_tags(tags),
+        "Tags": tags,
+        **readme_columns
+    }
+
+
+def enrich_datasets(datasets, desc="Enriching datasets", license_marker="license"):
+    """
+    Runs the model-count, size and README stages for every dataset concurrently.
+    Datasets unchanged since they were cached get their size and README columns
+    from the metadata cache; model counts are always looked up.
+    With an extraction journal, each record is written to it as soon as it is
+    finished and datasets already in it (from a resumed run) are skipped.
+    Returns one record per dataset, in the order of `datasets`.
+    """
+    cache = get_metadata_cache()
+    journal = get_extraction_journal()
+    if journal is not None:
+        resumed = {dataset.id for dataset in datasets if dataset.id in journal}
+        if resumed:
+            print(f"{len(resumed)} datasets already extracted, resuming with the rest")
+        pending = [dataset for dataset in datasets if dataset.id not in resumed]
+    else:
+        resumed = set()
+        pending = datasets
+
+    # Models counts change without the dataset changing, so only the other stages are cached
+    cached = {}
+    if cache is not None:
+        for dataset in pending:
+            results = get_cached_results(cache, dataset)
+            if results is not None:
+                cached[dataset.id] = results
+
+    def finish(dataset, results):
+        record = build_dataset_record(dataset, results, license_marker)
+        if journal is not None:
+            journal.append(dataset.id, record)
+        return record
+
+    def combine(dataset, results):
+        # Failed lookups are retried on the next run rather than cached
+        if cache is not None and dataset.id not in cached and not get_hub_client().has_failed(dataset.id):
+            cache.put(dataset.id, dataset.lastModified, {backend: value for backend, value in results.items() if backend != "hub"})
+        return finish(dataset, results)
+
+    def from_cache(backend, fn):
+        def stage(dataset):
+            results = cached.get(dataset.id)
+            return results[backend] if results is not None else fn(dataset)
+        return stage
+
+    profiler = get_profiler()
+    stages = {
+        backend: profiler.wrap(f"enrich:{backend}", fn) if backend == "hub" else from_cache(backend, profiler.wrap(f"enrich:{backend}", fn))
+        for backend, fn in get_enrichment_stages().items()
+    }
+    records = {}
+    for record in get_enrichment_engine().run(pending, stages, combine, desc=desc):
+        records[record["Dataset ID"]] = record
+
+    if resumed:
+        # Only the records of the interrupted run are read back; JSON turned their dates into strings
+        for dataset_id, record in journal.records(resumed).items():
+            if record["Last Modified"]:
+                record["Last Modified"] = datetime.fromisoformat(record["Last Modified"])
+            records[dataset_id] = record
+    return [records[dataset.id] for dataset in datasets]
+
+
+def get_arabic_datasets_by_task_categories(task_mapping):
+    import pandas as pd
+
     all_rows = []
     
     # Loop through each task
     for user_task, hf_task in task_mapping.items():
         # print(f"🔍 Processing task: {user_task} ({hf_task})")
         try:
-            datasets_list = list_datasets(task_categories=hf_task, language="ar")
+            with get_profiler().stage("list_datasets"):
+                datasets_list = list_arabic_datasets(task_categories=hf_task)
         except Exception as e:
             print(f"Failed to fetch for task {user_task}: {e}")
             continue
     
-        for dataset in datasets_list:
-            tags = dataset.tags if hasattr(dataset, "tags") else []
-    
-            try:
-                license = [tag for tag in dataset.tags if "license" in tag][0].split(":")[-1]
-            except:
-                license = "none"
-            try:
-                models = len(list(list_models(filter=f"dataset:{dataset.id}")))
-            except:
-                models = "none"
-    
-            # size = next((tag.split(":")[-1] for tag in tags if tag.startswith("size:")), "unknown")
-            Size_of_downloaded_dataset_files_str, Size_of_downloaded_dataset_files_bytes, Size_of_the_auto_converted_Parquet_files_str, Size_of_the_auto_converted_Parquet_files_bytes, Number_of_rows = get_dataset_size_info(dataset.id)
-            
-            arxiv_link = next((tag.split(":", 1)[-1] for tag in tags if tag.startswith("arxiv:")), "none")
-            if arxiv_link != "none":
-                arxiv_link = "https://arxiv.org/abs/"+arxiv_link
-
-            try:
-                readme = get_dataset_readme(dataset.id)
-                if len(readme) == 0:
-                    readme = "none" 
-                    
-                acl_links = extract_acl_links(readme)
-                if len(acl_links) == 0:
-                    acl_links = "none" 
-            except:
-                readme = "none"
-                acl_links = "none"  
-
-            readme_quality_level = classify_readme_level(readme)
-            readme_quality_score = get_readme_score(readme)
-
-            all_rows.append({
-                "Task": user_task,
-                "Dataset ID": dataset.id,
-                "Likes": dataset.likes,
-                "Downloads": dataset.downloads,
-                "Last Modified": dataset.lastModified,
-                "License": license,
-                "Models": models,
-                "Size of downloaded files": Size_of_downloaded_dataset_files_str.upper(),
-                "Size of downloaded files in bytes": Size_of_downloaded_dataset_files_bytes,
-                "Size of Parquet files": Size_of_the_auto_converted_Parquet_files_str.upper(),
-                "Size of Parquet files in bytes": Size_of_the_auto_converted_Parquet_files_bytes,
-                "Number of Rows" : Number_of_rows,
-                "ArXiv Paper": arxiv_link,
-                "ACL Paper": acl_links,
-                "README file": readme,
-                "README Quality Level": readme_quality_level,
-                "README Quality Score": readme_quality_score
-            })
+        for record in enrich_datasets(datasets_list, desc=user_task):
+            all_rows.append({"Task": user_task, **record})
     
     # Create DataFrame and save
     df = pd.DataFrame(all_rows)
@@ -214,174 +335,224 @@ def get_arabic_datasets_by_task_categories(task_mapping):
 
 
 
+def match_datasets_by_keywords(datasets_list, search_keywords, required_tags, required_modality):
+    matcher = KeywordMatcher(search_keywords, required_tags, required_modality)
+    return [dataset for dataset in datasets_list if matcher.matches(dataset.id, dataset.tags)]
+
+
+def get_datasets_info(dataset_ids, max_workers=8):
+    """
+    Fetches the Hub info of each dataset id concurrently; ids whose lookup
+    fails are recorded with the Hub client and skipped.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = get_hub_client()
+
+    def get_info(dataset_id):
+        try:
+            return client.api.dataset_info(dataset_id)
+        except Exception as e:
+            client.record_failure("dataset_info", dataset_id, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [info for info in executor.map(get_info, dataset_ids) if info is not None]
+
+
+# License tag marker of rows found by a keyword fallback, with -c and --all alike
+KEYWORD_LICENSE_MARKER = "license:"
+
+
 def get_arabic_datasets_by_keywords(search_keywords, required_tags, required_modality):
-    #from huggingface_hub import list_datasets
-    # Get only Arabic datasets
-    datasets_list = list_datasets(language="ar")
-   
-    dataset_rows = []
+    """
+    Keyword fallback for a category. Matches against the local Arabic dataset
+    index when one is configured (fetching only the matches' info), and lists
+    all Arabic datasets otherwise.
+    """
+    import pandas as pd
 
-    for dataset in datasets_list:
-        dataset_id = dataset.id.lower()
-        dataset_tags = dataset.tags or []
-
-        # Check for match in name 
-        name_match = any(keyword.lower() in dataset_id for keyword in search_keywords)
-        
-        # Make sure it's a text dataset
-        has_text_modality = required_modality in dataset_tags
-
-        if has_text_modality and (name_match ):
-            try:
-                license = [tag for tag in dataset_tags if "license:" in tag][0].split(":")[-1]
-            except:
-                license = "none"
-            try:
-                models = len(list(list_models(filter=f"dataset:{dataset.id}")))
-            except:
-                models = "none"
-
-            # size = next((tag.split(":")[-1] for tag in dataset_tags if tag.startswith("size:")), "unknown")
-            Size_of_downloaded_dataset_files_str, Size_of_downloaded_dataset_files_bytes, Size_of_the_auto_converted_Parquet_files_str, Size_of_the_auto_converted_Parquet_files_bytes, Number_of_rows = get_dataset_size_info(dataset.id)
-
-            arxiv_link = next((tag.split(":", 1)[-1] for tag in dataset_tags if tag.startswith("arxiv:")), "none")
-            if arxiv_link != "none":
-                arxiv_link = "https://arxiv.org/abs/"+arxiv_link
-
-            try:
-                readme = get_dataset_readme(dataset.id)
-                if len(readme) == 0:
-                    readme = "none" 
-                    
-                acl_links = extract_acl_links(readme)
-                if len(acl_links) == 0:
-                    acl_links = "none" 
-            except:
-                readme = "none"
-                acl_links = "none"  
-
-            readme_quality_level = classify_readme_level(readme)
-            readme_quality_score = get_readme_score(readme)
-            
-            dataset_rows.append({
-                "Dataset ID": dataset.id,
-                "Likes": dataset.likes,
-                "Downloads": dataset.downloads,
-                "Last Modified": dataset.lastModified,
-                "License": license,
-                "Models": models,
-                "Size of downloaded files": Size_of_downloaded_dataset_files_str.upper(),
-                "Size of downloaded files in bytes": Size_of_downloaded_dataset_files_bytes,
-                "Size of Parquet files": Size_of_the_auto_converted_Parquet_files_str.upper(),
-                "Size of Parquet files in bytes": Size_of_the_auto_converted_Parquet_files_bytes,
-                "Number of Rows" : Number_of_rows,
-                "ArXiv Paper": arxiv_link,
-                "ACL Paper": acl_links,
-                "README file": readme,
-                "README Quality Level": readme_quality_level,
-                "README Quality Score": readme_quality_score
-            })
+    index = get_dataset_index()
+    if index is not None:
+        with get_profiler().stage("match_keywords"):
+            matched_ids = index.match(KeywordMatcher(search_keywords, required_tags, required_modality))
+        matched_datasets = get_datasets_info(matched_ids)
+    else:
+        with get_profiler().stage("list_datasets"):
+            datasets_list = list_arabic_datasets()
+        matched_datasets = match_datasets_by_keywords(datasets_list, search_keywords, required_tags, required_modality)
+
+    dataset_rows = enrich_datasets(matched_datasets, desc="Keyword matches", license_marker=KEYWORD_LICENSE_MARKER)
 
     # Create and show DataFrame
     df = pd.DataFrame(dataset_rows)
     return df
 
 
-def load_task_mapping(yaml_file_path):
+def assign_datasets_to_tasks(datasets_list, task_mapping):
     """
-    Reads the task mapping from a YAML file and returns it as a Python dictionary.
+    Groups an Arabic dataset listing by task locally, the same way
+    `list_datasets(task_categories=...)` filters on `task_categories:<task>` tags.
     """
-    with open(yaml_file_path, "r", encoding="utf-8") as f:
-        task_mapping = yaml.safe_load(f)
-    return task_mapping
+    datasets_by_task = {user_task: [] for user_task in task_mapping}
+    task_tags = {user_task: f"task_categories:{hf_task}".lower() for user_task, hf_task in task_mapping.items()}
 
+    for dataset in datasets_list:
+        dataset_tags = {tag.lower() for tag in (dataset.tags or [])}
+        for user_task, task_tag in task_tags.items():
+            if task_tag in dataset_tags:
+                datasets_by_task[user_task].append(dataset)
 
+    return datasets_by_task
 
-if __name__ == "__main__":
 
-    #task_mapping = load_task_mapping("task_mapping.yaml")
-    task_mapping = {
-    "Q&A": "question-answering",
-    "Reasoning & Multi-step Thinking": "reasoning",
-    "Summarization": "summarization",
-    "Cultural Alignment": "cultural-aligned",
-    "Dialog/Conversation": "conversational",
-    "Personal Ownership/System Prompt": "System Prompt",  
-    "Robustness & Safety": "Safety",
-    "Function Call": "function-call",  
-    "Ethics, Bias, and Fairness": "bias-and-fairness",
-    "Code Generation": "Code Generation",
-    "Official Documentation": "documentation",
-    "Translation": "translation"
-}
+def get_arabic_datasets_for_all_categories(task_mapping, keywords_map=None):
+    """
+    Lists Arabic datasets once, assigns them to every category locally (falling back
+    to `keywords_map` for empty categories) and enriches each unique dataset once.
+    Returns one row per (category, dataset) pair.
+    """
+    import pandas as pd
+
+    with get_profiler().stage("list_datasets"):
+        datasets_list = list_arabic_datasets()
+    datasets_by_task = assign_datasets_to_tasks(datasets_list, task_mapping)
+
+    keyword_tasks = set()
+    for user_task, task_datasets in datasets_by_task.items():
+        if not task_datasets and keywords_map and user_task in keywords_map:
+            keyword_tasks.add(user_task)
+            kw_info = keywords_map[user_task]
+            datasets_by_task[user_task] = match_datasets_by_keywords(
+                datasets_list,
+                kw_info["search_keywords"],
+                kw_info["required_tags"],
+                kw_info["required_modality"]
+            )
+
+    unique_datasets = {}
+    for task_datasets in datasets_by_task.values():
+        for dataset in task_datasets:
+            unique_datasets.setdefault(dataset.id, dataset)
+
+    print(f"{len(datasets_list)} Arabic datasets listed, {len(unique_datasets)} unique datasets across {len(task_mapping)} categories")
+    records = dict(zip(unique_datasets, enrich_datasets(list(unique_datasets.values()), desc="All categories")))
+
+    all_rows = []
+    for user_task, task_datasets in datasets_by_task.items():
+        for dataset in task_datasets:
+            row = {"Task": user_task, **records[dataset.id]}
+            if user_task in keyword_tasks:
+                # Same License as the keyword fallback of `-c <category>`
+                row["License"] = get_dataset_license(dataset.tags, KEYWORD_LICENSE_MARKER)
+            all_rows.append(row)
+    return pd.DataFrame(all_rows)
+
+
+def get_category_filename(category, suffix="", file_format="csv"):
+    return f"{category.replace(' ', '_').replace('/', '_')}{suffix}.{file_format}"
 
-    # Keyword mapping per category (example)
-    keywords_map = {
-        "Reasoning & Multi-step Thinking": {
-            "search_keywords": ["Reasoning", "Multi-step reasoning"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Cultural Alignment": {
-            "search_keywords": ["cultural", "culture", "cidar"],
-            "required_tags": ["cultural-aligned"],
-            "required_modality": "modality:text"
-        },
-        "Dialog & Conversation": {
-            "search_keywords": ["Dialog", "Conversation"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Personal Ownership/System Prompt": {
-            "search_keywords": ["system prompt", "persona"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Robustness & Safety": {
-            "search_keywords": ["Robustness", "Safety", "Toxicity", "jailbreak"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Ethics, Bias, and Fairness": {
-            "search_keywords": ["Ethics", "Bias", "Fairness"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Function Call": {
-            "search_keywords": ["Function Call"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Code Generation": {
-            "search_keywords": ["code generation"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        },
-        "Official Documentation": {
-            "search_keywords": ["Documentation", "Official Documentation"],
-            "required_tags": [],
-            "required_modality": "modality:text"
-        }
-       
-    }
 
+def main(argv):
     category = None
     save = False
     list_categories = False
+    all_categories = False
+    per_task_files = False
+    pool_size = None
+    max_pages = 50
+    size_backend = "http"
+    concurrency = {}
+    cache_path = DEFAULT_CACHE_PATH
+    cache_ttl_days = DEFAULT_TTL_DAYS
+    cache_max_entries = DEFAULT_MAX_ENTRIES
+    model_index_path = None
+    rebuild_model_index = False
+    dataset_index_path = DEFAULT_DATASET_INDEX_PATH
+    rebuild_dataset_index = False
+    annotation_only = False
+    snapshot_dir = None
+    readme_store_path = None
+    out_format = "csv"
+    resume = False
+    profile = False
+    profile_json = None
+    rate_limit = DEFAULT_RATE
+    max_retries = DEFAULT_MAX_RETRIES
+    task_mapping_path = DEFAULT_TASK_MAPPING_PATH
+    keywords_map_path = DEFAULT_KEYWORDS_MAP_PATH
     try:
-      opts, _ = getopt.getopt(sys.argv[1:], "c:sl", ["category=", "save", "list"]) #
+      opts, _ = getopt.getopt(argv, "c:aslp:b:j:", ["category=", "all", "per-task", "save", "list", "pool-size=", "max-pages=", "size-backend=", "workers=", "hub-workers=", "page-workers=", "readme-workers=", "cache=", "no-cache", "cache-ttl=", "cache-max-entries=", "model-index=", "rebuild-model-index", "readme-store=", "format=", "resume", "profile", "profile-json=", "rate-limit=", "max-retries=", "dataset-index=", "no-dataset-index", "rebuild-dataset-index", "annotation-only", "snapshots=", "task-mapping=", "keywords-map="]) #
 
     except getopt.GetoptError:
-        print("Usage: python functions.py -c <category> [-s] | -l") 
+        print("Usage: python script.py -c <category> | -a [--per-task] [-s] [-b <size backend>] [-j <workers>] [-p <pool size>] [--max-pages <n>] [--cache <file> | --no-cache] [--cache-ttl <days>] [--cache-max-entries <n>] [--model-index <file>] [--rebuild-model-index] [--readme-store <dir>] [--format csv|parquet] [--resume] [--profile] [--profile-json <file>] [--rate-limit <requests/s>] [--max-retries <n>] [--dataset-index <file> | --no-dataset-index] [--rebuild-dataset-index] [--annotation-only] [--snapshots <dir>] [--task-mapping <yaml file>] [--keywords-map <yaml file>] | -l") 
         sys.exit(2)
 
     for opt, arg in opts:
         if opt in ("-c", "--category"):
             category = arg
+        elif opt in ("-a", "--all"):
+            all_categories = True
+        elif opt == "--per-task":
+            per_task_files = True
         elif opt in ("-s", "--save"):
             save = True
         elif opt in ("-l", "--list"):
             list_categories = True
+        elif opt in ("-p", "--pool-size"):
+            pool_size = int(arg)
+        elif opt == "--max-pages":
+            max_pages = int(arg)
+        elif opt in ("-b", "--size-backend"):
+            size_backend = arg
+        elif opt in ("-j", "--workers"):
+            concurrency.update({backend: int(arg) for backend in BACKENDS})
+        elif opt in ("--hub-workers", "--page-workers", "--readme-workers"):
+            concurrency[opt[2:].split("-")[0]] = int(arg)
+        elif opt == "--cache":
+            cache_path = arg
+        elif opt == "--no-cache":
+            cache_path = None
+        elif opt == "--cache-ttl":
+            cache_ttl_days = float(arg)
+        elif opt == "--cache-max-entries":
+            cache_max_entries = int(arg)
+        elif opt == "--model-index":
+            model_index_path = arg
+        elif opt == "--readme-store":
+            readme_store_path = arg
+        elif opt == "--format":
+            out_format = arg
+        elif opt == "--resume":
+            resume = True
+        elif opt == "--profile":
+            profile = True
+        elif opt == "--dataset-index":
+            dataset_index_path = arg
+        elif opt == "--no-dataset-index":
+            dataset_index_path = None
+        elif opt == "--rebuild-dataset-index":
+            rebuild_dataset_index = True
+        elif opt == "--snapshots":
+            snapshot_dir = arg
+        elif opt == "--annotation-only":
+            annotation_only = True
+        elif opt == "--rate-limit":
+            rate_limit = float(arg)
+        elif opt == "--max-retries":
+            max_retries = int(arg)
+        elif opt == "--task-mapping":
+            task_mapping_path = arg
+        elif opt == "--keywords-map":
+            keywords_map_path = arg
+        elif opt == "--profile-json":
+            profile = True
+            profile_json = arg
+        elif opt == "--rebuild-model-index":
+            rebuild_model_index = True
+            model_index_path = model_index_path or DEFAULT_MODEL_INDEX_PATH
+
+    task_mapping = load_task_mapping(task_mapping_path)
 
     if list_categories:
         print("Available Categories:")
@@ -389,50 +560,137 @@ if __name__ == "__main__":
             print(f" - {cat}")
         sys.exit(0)
 
-    if not category:
-        print("Please provide a category using -c or --category, or use -l to list categories.")
+    # pandas and the Hub libraries are only loaded past the category list
+    from catalog_io import FORMATS, write_catalog
+    from snapshot_store import SnapshotStore
+
+    keywords_map = load_keywords_map(keywords_map_path)
+
+    if not category and not all_categories:
+        print("Please provide a category using -c or --category, use -a to process all categories, or use -l to list categories.")
         sys.exit(2)
 
-    if category not in task_mapping:
+    if category and category not in task_mapping:
         # print(f"Invalid category. Available categories: {list(task_mapping.keys())}")
         print(f"Invalid category: '{category}'")
         print("Available categories:")
         for cat in task_mapping.keys():
             print(f" - {cat}")
         sys.exit(1)
-    print(f"Processing category: {category} ...")
-        
-    mapped_task = task_mapping[category]
-
-    # First try get by task category
-    df = get_arabic_datasets_by_task_categories({category: mapped_task})
-
-    # If empty or no data, fallback to keyword search if mapping exists
-    if df.empty and category in keywords_map:
-        print(f"\nNo data found for category '{category}', trying keyword search fallback...")
-        kw_info = keywords_map[category]
-        df = get_arabic_datasets_by_keywords(
-            kw_info["search_keywords"],
-            kw_info["required_tags"],
-            kw_info["required_modality"]
-        )
+
+    if size_backend not in SIZE_BACKENDS:
+        print(f"Invalid size backend: '{size_backend}'. Available backends: {', '.join(SIZE_BACKENDS)}")
+        sys.exit(2)
+
+    if out_format not in FORMATS:
+        print(f"Invalid format: '{out_format}'. Available formats: {', '.join(FORMATS)}")
+        sys.exit(2)
+
+    if resume and not save:
+        print("--resume continues an interrupted --save run; add -s or --save.")
+        sys.exit(2)
+
+    # Before the size provider and Hub sessions are created, so their calls are recorded
+    profiler = configure_profiler(enabled=profile)
+    hub_client = configure_hub_client(rate=rate_limit, max_retries=max_retries)
+    engine = configure_enrichment_engine(concurrency)
+    # One browser session per page-scraping worker unless told otherwise
+    configure_browser_pool(size=pool_size or engine.concurrency["page"], max_pages=max_pages)
+    configure_size_provider(size_backend)
+    cache = configure_metadata_cache(cache_path, ttl=cache_ttl_days * 24 * 3600, max_entries=cache_max_entries)
+    model_index = configure_model_index(model_index_path, rebuild=rebuild_model_index)
+    configure_dataset_index(dataset_index_path, rebuild=rebuild_dataset_index)
+    configure_annotation_only(annotation_only)
+    configure_readme_store(readme_store_path)
+
+    # Saved runs stream finished records to a journal next to the result file
+    journal = None
+    if save:
+        output_path = f"all_datasets_by_task.{out_format}" if all_categories else get_category_filename(category, file_format=out_format)
+        journal = configure_extraction_journal(get_journal_path(output_path), resume=resume)
+
+    if all_categories:
+        print("Processing all categories ...")
+        df = get_arabic_datasets_for_all_categories(task_mapping, keywords_map)
 
         if df.empty:
-            print(f"\n No data found for keywords fallback for category '{category}'.")
-            print(f"\n No data found for the category '{category}'.") #
+            print("\n No data found for any category.")
         else:
             print(df)
-            if save:
-                filename = f"{category.replace(' ', '_')}_keywords.csv"
-                df.to_csv(filename, index=False)
-                print(f"Keyword search data saved to {filename}")
+            if save and per_task_files:
+                for task, task_df in df.groupby("Task", sort=False):
+                    filename = get_category_filename(task, file_format=out_format)
+                    write_catalog(task_df, filename)
+                    print(f"Data saved to {filename}")
+            elif save:
+                filename = f"all_datasets_by_task.{out_format}"
+                write_catalog(df, filename)
+                print(f"Data saved to {filename}")
 
     else:
-        if df.empty:
-            print(f"\n No data found for the category '{category}'.")
+        print(f"Processing category: {category} ...")
+            
+        mapped_task = task_mapping[category]
+
+        # First try get by task category
+        df = get_arabic_datasets_by_task_categories({category: mapped_task})
+
+        # If empty or no data, fallback to keyword search if mapping exists
+        if df.empty and category in keywords_map:
+            print(f"\nNo data found for category '{category}', trying keyword search fallback...")
+            kw_info = keywords_map[category]
+            df = get_arabic_datasets_by_keywords(
+                kw_info["search_keywords"],
+                kw_info["required_tags"],
+                kw_info["required_modality"]
+            )
+
+            if df.empty:
+                print(f"\n No data found for keywords fallback for category '{category}'.")
+                print(f"\n No data found for the category '{category}'.") #
+            else:
+                print(df)
+                if save:
+                    filename = get_category_filename(category, "_keywords", out_format)
+                    write_catalog(df, filename)
+                    print(f"Keyword search data saved to {filename}")
+
         else:
-            print(df)
-            if save:
-                filename = f"{category.replace(' ', '_')}.csv"
-                df.to_csv(filename, index=False)
-                print(f"Data saved to {filename}")
\ No newline at end of file
+            if df.empty:
+                print(f"\n No data found for the category '{category}'.")
+            else:
+                print(df)
+                if save:
+                    filename = get_category_filename(category, file_format=out_format)
+                    write_catalog(df, filename)
+                    print(f"Data saved to {filename}")
+
+    if snapshot_dir and not df.empty:
+        # Only a run over all categories sees every dataset, so only it records removals
+        written = SnapshotStore(snapshot_dir).append(df, complete=all_categories)
+        print(f"Snapshot added to {snapshot_dir}: {written} datasets changed since the previous one")
+
+    if journal is not None:
+        # Results are saved (or there were none): compact away the journal
+        journal.finalize()
+
+    if model_index is not None:
+        # Keeps the datasets counted in this run for the next one
+        model_index.save()
+
+    if cache is not None:
+        cache.evict()
+        print(f"\n{cache.summary()}")
+
+    if hub_client.stats or hub_client.failures:
+        print(f"\n{hub_client.summary()}")
+
+    if profile:
+        print(f"\n{profiler.summary()}")
+        if profile_json:
+            profiler.dump(profile_json)
+            print(f"Profile saved to {profile_json}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,216 @@
+import os
+import re
+from collections import namedtuple
+
+from hub_client import get_hub_client
+from profiling import get_profiler
+
+
+DATASETS_SERVER_URL = os.environ.get("DATASETS_SERVER_URL", "https://datasets-server.huggingface.co")
+HUB_URL = os.environ.get("HF_ENDPOINT", "https://huggingface.co")
+
+SIZE_BACKENDS = ("http", "selenium", "http+selenium")
+
+# All fields are ints, or None when the value is not available for the dataset
+DatasetSizeInfo = namedtuple("DatasetSizeInfo", ["download_size_bytes", "parquet_size_bytes", "num_rows"])
+
+UNKNOWN_SIZE_INFO = DatasetSizeInfo(None, None, None)
+
+
+def covert_sizes_to_bytes(size):
+    pattern = r'(\d+(?:\.\d+)?)\s*(KB|MB|GB|TB)'
+    matches = re.findall(pattern, size, flags=re.IGNORECASE)
+
+    size_map = {
+        'KB': 1024,
+        'MB': 1024 ** 2,
+        'GB': 1024 ** 3,
+        'TB': 1024 ** 4
+    }
+
+    for value, unit in matches:
+        unit_upper = unit.upper()
+        bytes_size = float(value) * size_map[unit_upper]
+
+    return bytes_size
+
+
+def format_size(num_bytes):
+    """
+    Formats a byte count the way the dataset page shows it (e.g. "4.15 GB").
+    """
+    if num_bytes is None:
+        return "UNKNOWN"
+
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.2f} {unit}" if unit != "B" else f"{int(num_bytes)} B"
+        num_bytes /= 1024
+    return f"{num_bytes:.2f} TB"
+
+
+def _to_int(value):
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SizeProvider:
+    """
+    Returns a DatasetSizeInfo for a dataset id. Subclasses implement `get_size_info`.
+    """
+
+    name = None
+
+    def get_size_info(self, dataset_id):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpSizeProvider(SizeProvider):
+    """
+    Reads sizes and row counts from the dataset viewer `/size` JSON endpoint
+    over a pooled keep-alive session of the shared Hub client, so requests are
+    rate limited and retried. No browser is involved.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url=DATASETS_SERVER_URL, session=None, timeout=30, pool_maxsize=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        if session is None:
+            session = get_hub_client().new_session(pool_maxsize=pool_maxsize)
+        else:
+            session = get_profiler().instrument_session(session)
+        self.session = session
+
+    def get_size_info(self, dataset_id):
+        response = self.session.get(f"{self.base_url}/size", params={"dataset": dataset_id}, timeout=self.timeout)
+
+        # The viewer answers these for datasets it does not (or cannot) support
+        if response.status_code in (400, 401, 403, 404, 501):
+            return UNKNOWN_SIZE_INFO
+        response.raise_for_status()
+
+        size = response.json().get("size", {}).get("dataset", {})
+        return DatasetSizeInfo(
+            _to_int(size.get("num_bytes_original_files")),
+            _to_int(size.get("num_bytes_parquet_files")),
+            _to_int(size.get("num_rows")),
+        )
+
+    def close(self):
+        self.session.close()
+
+
+# Tailwind classes of the size/rows boxes on the dataset page
+SIZE_BOX_CLASS = 'bg-linear-to-r dark:via-none group mb-1.5 flex max-w-full flex-col overflow-hidden rounded-lg border border-gray-100 from-white via-white to-white px-2 py-1 hover:from-gray-50 dark:from-gray-900 dark:to-gray-925 dark:hover:to-gray-900 md:mr-1.5 pointer-events-none'
+PARQUET_SIZE_CLASS = 'truncate text-sm group-hover:underline'
+
+
+def parse_size_info_from_page(page_source):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    size_boxes = soup.find_all('a', class_=SIZE_BOX_CLASS)
+
+    try:
+        download_size_str = size_boxes[0].text.strip("Size of downloaded dataset files:").strip("\n")
+        download_size = _to_int(covert_sizes_to_bytes(download_size_str))
+    except (IndexError, UnboundLocalError):
+        download_size = None
+
+    try:
+        parquet_size_str = soup.find_all('div', class_=PARQUET_SIZE_CLASS)[-1].text.strip()
+        parquet_size = _to_int(covert_sizes_to_bytes(parquet_size_str))
+    except (IndexError, UnboundLocalError):
+        parquet_size = None
+
+    try:
+        num_rows = size_boxes[1].text.strip("Number of rows:").strip("\n")
+        num_rows = _to_int(num_rows.strip(",").replace(",", ""))
+    except IndexError:
+        num_rows = None
+
+    return DatasetSizeInfo(download_size, parquet_size, num_rows)
+
+
+class SeleniumSizeProvider(SizeProvider):
+    """
+    Renders the dataset page in a pooled headless browser and scrapes the size boxes.
+    """
+
+    name = "selenium"
+
+    def __init__(self, hub_url=HUB_URL, pool=None):
+        self.hub_url = hub_url.rstrip("/")
+        self.pool = pool
+
+    def get_size_info(self, dataset_id):
+        from browser_pool import fetch_page_source
+
+        page_source = fetch_page_source(f"{self.hub_url}/datasets/{dataset_id}", pool=self.pool)
+        return parse_size_info_from_page(page_source)
+
+
+class FallbackSizeProvider(SizeProvider):
+    """
+    Uses `primary` and falls back to `fallback` when it fails or knows nothing about the dataset.
+    """
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+
+    def get_size_info(self, dataset_id):
+        try:
+            info = self.primary.get_size_info(dataset_id)
+        except Exception as e:
+            print(f"{self.primary.name} size lookup failed for {dataset_id}: {e}")
+            info = UNKNOWN_SIZE_INFO
+
+        if info == UNKNOWN_SIZE_INFO:
+            return self.fallback.get_size_info(dataset_id)
+        return info
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+
+def get_size_provider(backend="http", **kwargs):
+    """
+    Builds the size provider for a backend name from SIZE_BACKENDS.
+    """
+    if backend == "http":
+        return HttpSizeProvider(**kwargs)
+    elif backend == "selenium":
+        return SeleniumSizeProvider(**kwargs)
+    elif backend == "http+selenium":
+        return FallbackSizeProvider(HttpSizeProvider(), SeleniumSizeProvider())
+    raise ValueError(f"Unknown size backend '{backend}'. Available backends: {', '.join(SIZE_BACKENDS)}")
+
+
+_default_provider = None
+
+
+def configure_size_provider(backend="http", **kwargs):
+    global _default_provider
+    if _default_provider is not None:
+        _default_provider.close()
+    _default_provider = get_size_provider(backend, **kwargs)
+    return _default_provider
+
+
+def get_default_size_provider():
+    global _default_provider
+    if _default_provider is None:
+        _default_provider = get_size_provider("http")
+    return _default_provider
@@ -0,0 +1,256 @@
+import os
+import sys
+import getopt
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from catalog_io import read_catalog
+
+
+DEFAULT_SNAPSHOT_DIR = "snapshots"
+
+# Values tracked across crawls; everything else is only kept in the latest catalog
+TRACKED_COLUMNS = ['Likes', 'Downloads', 'Models', 'Last Modified']
+GROWTH_COLUMNS = ['Likes', 'Downloads', 'Models']
+
+# Snapshots are single files named after the time they were taken, down to
+# the microsecond; names from whole-second stores are still read
+SNAPSHOT_FORMAT = "snapshot-%Y%m%dT%H%M%S.%fZ.parquet"
+LEGACY_SNAPSHOT_FORMATS = ["snapshot-%Y%m%dT%H%M%SZ.parquet"]
+
+
+def parse_snapshot_name(name):
+    """
+    Time a snapshot file name stands for, or None for other files.
+    """
+    for snapshot_format in [SNAPSHOT_FORMAT] + LEGACY_SNAPSHOT_FORMATS:
+        try:
+            return datetime.strptime(name, snapshot_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_snapshot(df):
+    """
+    One row per dataset with the tracked values typed (failed counts such as
+    "none" become missing), indexed by `Dataset ID`.
+    """
+    df = df[df["Dataset ID"].notnull()].drop_duplicates("Dataset ID").set_index("Dataset ID")
+    values = pd.DataFrame(index=df.index)
+    for col in TRACKED_COLUMNS:
+        if col not in df.columns:
+            values[col] = pd.NA
+        elif col == 'Last Modified':
+            values[col] = pd.to_datetime(df[col], utc=True, errors="coerce")
+        else:
+            values[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+    return values
+
+
+class SnapshotStore:
+    """
+    Append-only history of the tracked values of every dataset, one small
+    Parquet file per crawl under `directory`.
+
+    Each file only holds the values that changed since the previous snapshot
+    (unchanged values are missing) and the datasets that appeared or, for
+    complete crawls, disappeared (`Removed`). The state at any snapshot is
+    the last known value of each column, so reading it reads every file up
+    to that snapshot.
+    """
+
+    def __init__(self, directory=DEFAULT_SNAPSHOT_DIR):
+        self.directory = directory
+
+    def snapshots(self):
+        """
+        Times of the stored snapshots, oldest first.
+        """
+        return sorted(self._files())
+
+    def _files(self):
+        """
+        {time taken: file name} of the stored snapshots.
+        """
+        if not os.path.isdir(self.directory):
+            return {}
+        files = {}
+        for name in os.listdir(self.directory):
+            taken_at = parse_snapshot_name(name)
+            if taken_at is not None:
+                files[taken_at] = name
+        return files
+
+    def _read_deltas(self, end=None, columns=None):
+        files = self._files()
+        times = sorted(taken_at for taken_at in files if end is None or taken_at <= end)
+        if not times:
+            return pd.DataFrame(columns=["Dataset ID", "snapshot", "Removed"] + (columns or TRACKED_COLUMNS))
+
+        columns = ["Dataset ID", "Removed"] + (columns or TRACKED_COLUMNS)
+        parts = []
+        for taken_at in times:
+            part = pd.read_parquet(os.path.join(self.directory, files[taken_at]), columns=columns)
+            part.insert(1, "snapshot", pd.Timestamp(taken_at))
+            parts.append(part)
+        return pd.concat(parts, ignore_index=True)
+
+    def state(self, at=None, columns=None):
+        """
+        Tracked values of every dataset present at snapshot `at` (default: the
+        latest), indexed by `Dataset ID`.
+        """
+        deltas = self._read_deltas(at, columns)
+        # `last` skips missing values, i.e. the columns a delta left unchanged
+        state = deltas.drop(columns="snapshot").groupby("Dataset ID", sort=True).last()
+        removed = state.pop("Removed").fillna(False).astype(bool)
+        return state[~removed]
+
+    def history(self, dataset_ids=None, columns=None, last=None):
+        """
+        Long frame of (`Dataset ID`, `snapshot`, values) with the state of each
+        dataset at each of the `last` snapshots (default: all), for trend plots.
+        """
+        snapshots = [pd.Timestamp(taken_at) for taken_at in self.snapshots()]
+        times = snapshots[-last:] if last else snapshots
+        if not times:
+            return pd.DataFrame(columns=["Dataset ID", "snapshot"] + (columns or TRACKED_COLUMNS))
+
+        # One read of the deltas: every dataset at every snapshot, each value
+        # carried forward from the last delta that set it
+        deltas = self._read_deltas(columns=columns)
+        if dataset_ids is not None:
+            deltas = deltas[deltas["Dataset ID"].isin(list(dataset_ids))]
+        snapshots = pd.Index(snapshots, dtype=deltas["snapshot"].dtype)
+        grid = pd.MultiIndex.from_product([sorted(deltas["Dataset ID"].unique()), snapshots], names=["Dataset ID", "snapshot"])
+        states = deltas.set_index(["Dataset ID", "snapshot"]).reindex(grid).groupby(level="Dataset ID").ffill()
+
+        # Not yet seen (no `Removed` so far) counts as absent, like removed
+        removed = states.pop("Removed").fillna(True).astype(bool)
+        states = states[~removed & states.index.get_level_values("snapshot").isin(times)]
+        return states.reset_index().sort_values(["snapshot", "Dataset ID"], ignore_index=True)
+
+    def growth(self, window=4, columns=GROWTH_COLUMNS):
+        """
+        Change of each column between the snapshot `window` crawls before the
+        latest one (the oldest if there are fewer) and the latest, as
+        `<column> growth`. Datasets not present in both are missing (no history).
+        """
+        times = self.snapshots()
+        growth_columns = [f"{col} growth" for col in columns]
+        if len(times) < 2:
+            return pd.DataFrame(columns=growth_columns, dtype="Float64")
+
+        latest = self.state(times[-1], list(columns))
+        earlier = self.state(times[max(0, len(times) - 1 - window)], list(columns))
+        growth = latest.astype("Float64") - earlier.astype("Float64").reindex(latest.index)
+        growth.columns = growth_columns
+        return growth
+
+    def append(self, df, taken_at=None, complete=False):
+        """
+        Records a crawl (rows with `Dataset ID` and the tracked columns; extra
+        rows of the same dataset are ignored). With `complete`, datasets absent
+        from `df` are marked as removed. Returns the number of rows written.
+
+        Snapshots are deltas of the previous one, so `taken_at` must be later
+        than every stored snapshot (backfill older crawls oldest first).
+        """
+        taken_at = taken_at or datetime.now(timezone.utc)
+        if taken_at.tzinfo is None:
+            taken_at = taken_at.replace(tzinfo=timezone.utc)
+        taken_at = taken_at.astimezone(timezone.utc)
+        times = self.snapshots()
+        if times and taken_at <= times[-1]:
+            raise ValueError(f"A snapshot taken at {taken_at:%Y-%m-%d %H:%M:%S.%f} must be later than the latest one ({times[-1]:%Y-%m-%d %H:%M:%S.%f})")
+        current = normalize_snapshot(df)
+        deltas_so_far = self._read_deltas()
+        previous = deltas_so_far.drop(columns="snapshot").groupby("Dataset ID").last()
+        was_removed = previous.pop("Removed").fillna(False).astype(bool)
+        previous = previous.reindex(current.index)
+
+        # Values that are new or differ from the last known ones; the rest stay missing
+        delta = pd.DataFrame(index=current.index)
+        for col in TRACKED_COLUMNS:
+            old, new = previous[col].astype(current[col].dtype), current[col]
+            changed = new.notnull() & (old.isnull() | (new != old).fillna(True))
+            delta[col] = new.where(changed)
+
+        # Datasets seen for the first time, or again after being removed
+        appeared = ~current.index.isin(was_removed.index) | current.index.isin(was_removed.index[was_removed])
+        delta["Removed"] = pd.Series(pd.NA, index=delta.index, dtype="boolean").mask(appeared, False)
+
+        if complete:
+            gone = was_removed.index[~was_removed & ~was_removed.index.isin(current.index)]
+            removed = pd.DataFrame({col: pd.Series(pd.NA, index=gone, dtype=delta[col].dtype) for col in TRACKED_COLUMNS})
+            removed["Removed"] = pd.Series(True, index=gone, dtype="boolean")
+            delta = pd.concat([delta, removed]) if len(gone) else delta
+
+        delta = delta[delta[TRACKED_COLUMNS].notnull().any(axis=1) | delta["Removed"].notnull()]
+        delta = delta.rename_axis("Dataset ID").reset_index()[["Dataset ID", "Removed"] + TRACKED_COLUMNS]
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, taken_at.strftime(SNAPSHOT_FORMAT))
+        if os.path.exists(path):
+            raise FileExistsError(f"Snapshot {path} already exists")
+        tmp_path = f"{path}.tmp"
+        delta.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return len(delta)
+
+
+def main(argv):
+    directory = DEFAULT_SNAPSHOT_DIR
+    dataset_ids = None
+    last = None
+    usage = "Usage: python snapshot_store.py [-d <snapshot dir>] [--add <catalog> [--complete] [--taken-at <ISO time>]] [--history <dataset id,...>] [--growth <n snapshots>] [--last <n>]"
+
+    try:
+        opts, _ = getopt.getopt(argv, "d:", ["dir=", "add=", "complete", "taken-at=", "history=", "growth=", "last="])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+
+    add_file = None
+    complete = False
+    taken_at = None
+    growth_window = None
+    for opt, arg in opts:
+        if opt in ("-d", "--dir"):
+            directory = arg
+        elif opt == "--add":
+            add_file = arg
+        elif opt == "--complete":
+            complete = True
+        elif opt == "--taken-at":
+            # e.g. 2025-06-01 or 2025-06-01T12:00:00Z; times without a zone are UTC
+            taken_at = datetime.fromisoformat(arg.replace("Z", "+00:00"))
+        elif opt == "--history":
+            dataset_ids = [dataset_id.strip() for dataset_id in arg.split(",") if dataset_id.strip()]
+        elif opt == "--growth":
+            growth_window = int(arg)
+        elif opt == "--last":
+            last = int(arg)
+
+    store = SnapshotStore(directory)
+    if add_file:
+        try:
+            written = store.append(read_catalog(add_file, columns=["Dataset ID"] + TRACKED_COLUMNS), taken_at=taken_at, complete=complete)
+        except (ValueError, FileExistsError) as e:
+            print(e)
+            sys.exit(1)
+        print(f"Snapshot of {add_file} added to {directory}: {written} changed datasets")
+    if dataset_ids:
+        print(store.history(dataset_ids, last=last).to_string(index=False))
+    if growth_window:
+        growth = store.growth(growth_window).sort_values("Downloads growth", ascending=False)
+        print(growth.head(last or 20).to_string())
+
+    times = store.snapshots()
+    print(f"{len(times)} snapshots in {directory}" + (f", {times[0]:%Y-%m-%d} to {times[-1]:%Y-%m-%d}" if times else ""))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])